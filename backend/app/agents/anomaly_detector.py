@@ -1,13 +1,20 @@
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime, timedelta
 from sklearn.ensemble import IsolationForest
 import asyncio
+from ..config import settings
+from ..data.audio import decode_audio
+from ..data.spectral import SpectralFeatureExtractor, FAULT_FREQUENCIES
+
+MIN_FAULT_CYCLES = 10
 
 class AnomalyDetectorAgent:
-    def __init__(self, cerebras_service, db_session):
+    def __init__(self, cerebras_service, db_session, prediction_cache=None, spectral_extractor=None):
         self.cerebras = cerebras_service
         self.db = db_session
+        self.prediction_cache = prediction_cache
+        self.spectral_extractor = spectral_extractor or SpectralFeatureExtractor(shaft_hz=settings.VIBRATION_SHAFT_HZ)
         self.models = {}
         self.anomaly_history = []
         self.detection_threshold = 0.75
@@ -20,13 +27,22 @@ class AnomalyDetectorAgent:
             sensor_data.get("power_consumption", 0)
         ]).reshape(1, -1)
         
-        cerebras_response = await self.cerebras.inference_request({
-            "model": "anomaly_detection",
-            "input_features": features.tolist(),
-            "machine_id": machine_id
-        })
-        
-        anomaly_score = cerebras_response.get("anomaly_score", 0.0)
+        cache_key = None
+        anomaly_score = None
+        if self.prediction_cache is not None:
+            cache_key = self.prediction_cache.make_key(sensor_data, "cerebras:anomaly_detection")
+            anomaly_score = self.prediction_cache.get(cache_key)
+        
+        if anomaly_score is None:
+            cerebras_response = await self.cerebras.inference_request({
+                "model": "anomaly_detection",
+                "input_features": features.tolist(),
+                "machine_id": machine_id
+            })
+            
+            anomaly_score = cerebras_response.get("anomaly_score", 0.0)
+            if cache_key is not None and not cerebras_response.get("fallback"):
+                self.prediction_cache.put(cache_key, anomaly_score)
         is_anomaly = anomaly_score > self.detection_threshold
         
         anomaly_result = {
@@ -139,18 +155,52 @@ class AnomalyDetectorAgent:
         }
         await self.db.create_alert(alert)
     
-    async def analyze_vibration_patterns(self, machine_id: str, audio_data: bytes) -> Dict[str, Any]:
-        cerebras_response = await self.cerebras.inference_request({
-            "model": "vibration_analysis",
-            "audio_data": audio_data,
-            "machine_id": machine_id,
-            "ultra_low_latency": True
-        })
+    async def analyze_vibration_patterns(self, machine_id: str, audio_data: bytes,
+                                         sample_rate: Optional[int] = None) -> Dict[str, Any]:
+        signal, sample_rate = decode_audio(audio_data, sample_rate or settings.VIBRATION_SAMPLE_RATE)
+        features = await asyncio.to_thread(self.spectral_extractor.extract_one, signal, sample_rate)
+        suspected_faults = [
+            name for name in FAULT_FREQUENCIES
+            if features[f"envelope_{name}"] > settings.VIBRATION_ENVELOPE_THRESHOLD
+        ]
+        
+        cerebras_response = {}
+        if settings.VIBRATION_REMOTE_INFERENCE:
+            cerebras_response = await self.cerebras.inference_request({
+                "model": "vibration_analysis",
+                "input_features": [list(features.values())],
+                "feature_names": self.spectral_extractor.feature_names,
+                "sample_rate": sample_rate,
+                "machine_id": machine_id,
+                "ultra_low_latency": True
+            })
         
         return {
             "machine_id": machine_id,
             "timestamp": datetime.utcnow().isoformat(),
-            "bearing_condition": cerebras_response.get("bearing_health", "unknown"),
-            "vibration_frequency": cerebras_response.get("dominant_frequency", 0),
-            "anomaly_detected": cerebras_response.get("is_anomalous", False)
-        }
\ No newline at end of file
+            "bearing_condition": cerebras_response.get("bearing_health") or self._local_bearing_condition(
+                features, suspected_faults, len(signal) / sample_rate
+            ),
+            "vibration_frequency": cerebras_response.get("dominant_frequency", features["dominant_frequency"]),
+            "anomaly_detected": cerebras_response.get("is_anomalous", bool(suspected_faults)),
+            "suspected_faults": suspected_faults,
+            "spectral_features": features
+        }
+    
+    def _local_bearing_condition(self, features: Dict[str, float], suspected_faults: List[str],
+                                 duration_seconds: float) -> str:
+        if suspected_faults:
+            return "faulty"
+        
+        # Low envelope peaks only count as evidence of health when the clip has
+        # signal and is long enough to resolve the slowest fault frequency.
+        fault_frequencies = self.spectral_extractor.fault_frequencies
+        if not fault_frequencies or not features["rms"] > 0:
+            return "unknown"
+        if duration_seconds < MIN_FAULT_CYCLES / min(fault_frequencies.values()):
+            return "unknown"
+        
+        envelope = [features[f"envelope_{name}"] for name in FAULT_FREQUENCIES]
+        if not all(np.isfinite(value) and value > 0 for value in envelope):
+            return "unknown"
+        return "healthy"
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "FactoryBrain AI"
@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     RAINDROP_SQL_ENDPOINT: str = ""
     RAINDROP_MEMORY_ENDPOINT: str = ""
     RAINDROP_INFERENCE_ENDPOINT: str = ""
+    RAINDROP_STORE_CONCURRENCY: int = 16
     
     VULTR_KUBERNETES_ENDPOINT: str = ""
     VULTR_OBJECT_STORAGE_ENDPOINT: str = ""
@@ -29,11 +30,79 @@ class Settings(BaseSettings):
     
     IOT_BROKER_HOST: str = "localhost"
     IOT_BROKER_PORT: int = 1883
+    IOT_BROKER_TRANSPORT: str = "thread"
+    IOT_PAYLOAD_FORMAT: str = "json"
+    IOT_QUEUE_MAXSIZE: int = 10000
+    IOT_OVERFLOW_POLICY: str = "drop_oldest"
+    IOT_BLOCK_TIMEOUT_SECONDS: float = 1.0
+    IOT_DRAIN_TIMEOUT_SECONDS: float = 5.0
+    IOT_DISPATCH_CONCURRENCY: int = 8
+    INGEST_MAX_BATCH_SIZE: int = 1000
+    INGEST_MAX_WAIT_MS: float = 50.0
+    INGEST_MAX_PENDING_BATCHES: int = 8
     
     ANOMALY_THRESHOLD: float = 0.75
     ENERGY_OPTIMIZATION_MODE: bool = True
     CO2_REDUCTION_TARGET: float = 0.20
     
+    INFERENCE_MAX_BATCH_SIZE: int = 256
+    INFERENCE_MAX_WAIT_MS: float = 2.0
+    
+    ML_INFERENCE_EXECUTOR: str = "thread"
+    ML_INFERENCE_WORKERS: int = 4
+    ML_TRAINING_EXECUTOR: str = "process"
+    ML_TRAINING_WORKERS: int = 1
+    ML_MODEL_MMAP_MODE: str = "r"
+    ML_PRELOAD_MODELS: bool = False
+    ML_INFERENCE_BACKEND: str = "sklearn"
+    ML_COMPILED_MAX_BATCH_ROWS: int = 256
+    ML_FOLD_SCALER: bool = False
+    
+    ANOMALY_CACHE_ENABLED: bool = False
+    ANOMALY_CACHE_STEPS: Dict[str, float] = {
+        "temperature": 0.5,
+        "vibration": 0.01,
+        "pressure": 0.5,
+        "power_consumption": 0.5
+    }
+    ANOMALY_CACHE_MAX_ENTRIES: int = 50000
+    ANOMALY_CACHE_TTL_SECONDS: float = 30.0
+    
+    ML_WORKER_QUEUE: str = "factorybrain:ml_jobs"
+    ML_WORKER_CONCURRENCY: int = 4
+    ML_WORKER_RESULT_TTL_SECONDS: int = 300
+    
+    ONLINE_UPDATE_BUFFER_SIZE: int = 5000
+    ONLINE_UPDATE_MIN_NEW_SAMPLES: int = 200
+    ONLINE_UPDATE_INTERVAL_SECONDS: float = 3600.0
+    ONLINE_UPDATE_NEW_ESTIMATORS: int = 20
+    ONLINE_UPDATE_MAX_ESTIMATORS: int = 400
+    
+    DATASET_CACHE_ENABLED: bool = True
+    DATASET_CACHE_DIR: str = "data/cache"
+    DATASET_STREAM_CHUNK_ROWS: int = 250000
+    DATASET_STREAM_MIN_FILE_MB: int = 256
+    
+    OUTLIER_HALFLIFE_READINGS: float = 60.0
+    OUTLIER_Z_THRESHOLD: float = 3.0
+    OUTLIER_WARMUP_READINGS: int = 30
+    OUTLIER_ROBUST: bool = False
+    
+    VIBRATION_SAMPLE_RATE: int = 16000
+    VIBRATION_SHAFT_HZ: float = 29.95
+    VIBRATION_ENVELOPE_THRESHOLD: float = 20.0
+    VIBRATION_REMOTE_INFERENCE: bool = True
+    
+    ACOUSTIC_CORPUS_DIR: str = "data/raw/acoustic"
+    ACOUSTIC_WINDOW_SECONDS: float = 1.0
+    ACOUSTIC_HOP_SECONDS: float = 0.0
+    ACOUSTIC_FEATURE_WORKERS: int = 0
+    
+    CMAPSS_DATA_DIR: str = "data/raw/cmapss"
+    CMAPSS_WINDOW: int = 30
+    CMAPSS_WINDOW_STRIDE: int = 1
+    CMAPSS_RUL_CAP: int = 125
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,158 @@
+import os
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, Future
+from collections import deque
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from ..config import settings
+from .audio import read_wav_header, to_float_samples
+from .spectral import SpectralFeatureExtractor
+
+AUDIO_EXTENSIONS = ('.wav',)
+MIMII_LABELS = ('normal', 'abnormal')
+METADATA_COLUMNS = ['path', 'machine_type', 'machine_id', 'label', 'is_anomaly', 'start_seconds']
+
+def parse_corpus_path(root: str, path: str) -> Dict[str, Any]:
+    parts = os.path.relpath(path, root).split(os.sep)
+    directories, file_name = parts[:-1], parts[-1].lower()
+
+    label = next((part for part in reversed(directories) if part in MIMII_LABELS), None)
+    if label is None:
+        label = 'abnormal' if file_name.startswith(('abnormal', 'anomaly')) else \
+            'normal' if file_name.startswith('normal') else 'unknown'
+
+    machine_id = next((part for part in reversed(directories) if part.startswith('id_')), None)
+    machine_type = None
+    if machine_id is not None:
+        position = len(directories) - 1 - directories[::-1].index(machine_id)
+        machine_type = directories[position - 1] if position > 0 else None
+
+    return {
+        "path": path,
+        "machine_type": machine_type,
+        "machine_id": machine_id,
+        "label": label
+    }
+
+def scan_corpus(root: str) -> List[Dict[str, Any]]:
+    entries = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        for file_name in sorted(files):
+            if not file_name.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+
+            path = os.path.join(directory, file_name)
+            try:
+                with open(path, 'rb') as fh:
+                    header = read_wav_header(fh)
+            except (OSError, ValueError, EOFError) as e:
+                print(f"Skipping {path}: {e}")
+                continue
+            entries.append({**parse_corpus_path(root, path), **header})
+    return entries
+
+def open_samples(entry: Dict[str, Any]) -> np.ndarray:
+    if entry["n_frames"] == 0:
+        return np.empty((0, entry["channels"]), dtype=entry["dtype"])
+    return np.memmap(
+        entry["path"], dtype=entry["dtype"], mode='r', offset=entry["data_offset"],
+        shape=(entry["n_frames"], entry["channels"])
+    )
+
+def window_starts(n_frames: int, window_frames: int, hop_frames: int) -> np.ndarray:
+    if n_frames < window_frames:
+        return np.zeros(0, dtype=np.int64)
+    return np.arange(0, n_frames - window_frames + 1, hop_frames, dtype=np.int64)
+
+def read_windows(samples: np.ndarray, starts: np.ndarray, window_frames: int) -> np.ndarray:
+    windows = np.empty((len(starts), window_frames), dtype=np.float32)
+    for row, start in enumerate(starts):
+        frames = to_float_samples(np.asarray(samples[start:start + window_frames]))
+        windows[row] = frames.mean(axis=1) if frames.shape[1] > 1 else frames[:, 0]
+    return windows
+
+def iter_windows(entries: List[Dict[str, Any]], window_seconds: float,
+                 hop_seconds: Optional[float] = None) -> Iterator[Tuple[Dict[str, Any], float, np.ndarray]]:
+    for entry in entries:
+        window_frames = int(round(window_seconds * entry["sample_rate"]))
+        hop_frames = int(round((hop_seconds or window_seconds) * entry["sample_rate"]))
+        samples = open_samples(entry)
+        for start in window_starts(entry["n_frames"], window_frames, hop_frames):
+            yield entry, start / entry["sample_rate"], read_windows(samples, [start], window_frames)[0]
+        del samples
+
+def extract_file_features(entry: Dict[str, Any], extractor: SpectralFeatureExtractor, window_seconds: float,
+                          hop_seconds: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    sample_rate = entry["sample_rate"]
+    window_frames = int(round(window_seconds * sample_rate))
+    hop_frames = int(round((hop_seconds or window_seconds) * sample_rate))
+    starts = window_starts(entry["n_frames"], window_frames, hop_frames)
+    features = np.empty((len(starts), len(extractor.feature_names)), dtype=np.float32)
+
+    samples = open_samples(entry)
+    for batch_start in range(0, len(starts), extractor.batch_size):
+        batch = starts[batch_start:batch_start + extractor.batch_size]
+        windows = read_windows(samples, batch, window_frames)
+        features[batch_start:batch_start + len(batch)] = extractor.extract(windows, sample_rate)
+    del samples
+
+    return starts / sample_rate, features
+
+def _features_frame(entry: Dict[str, Any], feature_names: List[str],
+                    start_seconds: np.ndarray, features: np.ndarray) -> pd.DataFrame:
+    n_windows = len(start_seconds)
+    df = pd.DataFrame({
+        'path': [entry["path"]] * n_windows,
+        'machine_type': [entry["machine_type"]] * n_windows,
+        'machine_id': [entry["machine_id"]] * n_windows,
+        'label': [entry["label"]] * n_windows,
+        'is_anomaly': np.full(n_windows, entry["label"] == 'abnormal', dtype=np.int8),
+        'start_seconds': start_seconds.astype(np.float32)
+    })
+    for index, name in enumerate(feature_names):
+        df[name] = features[:, index]
+    return df
+
+def iter_corpus_features(entries: List[Dict[str, Any]], extractor: Optional[SpectralFeatureExtractor] = None,
+                         window_seconds: Optional[float] = None, hop_seconds: Optional[float] = None,
+                         workers: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    extractor = extractor or SpectralFeatureExtractor(shaft_hz=settings.VIBRATION_SHAFT_HZ)
+    window_seconds = window_seconds or settings.ACOUSTIC_WINDOW_SECONDS
+    hop_seconds = hop_seconds or settings.ACOUSTIC_HOP_SECONDS or window_seconds
+    workers = workers or settings.ACOUSTIC_FEATURE_WORKERS or os.cpu_count() or 1
+
+    if workers == 1:
+        for entry in entries:
+            start_seconds, features = extract_file_features(entry, extractor, window_seconds, hop_seconds)
+            yield _features_frame(entry, extractor.feature_names, start_seconds, features)
+        return
+
+    max_pending = 2 * workers
+    pending: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for entry in entries:
+            pending.append((entry, pool.submit(extract_file_features, entry, extractor, window_seconds, hop_seconds)))
+            if len(pending) >= max_pending:
+                yield _collect(pending.popleft(), extractor.feature_names)
+        while pending:
+            yield _collect(pending.popleft(), extractor.feature_names)
+
+def _collect(item: Tuple[Dict[str, Any], Future], feature_names: List[str]) -> pd.DataFrame:
+    entry, future = item
+    start_seconds, features = future.result()
+    return _features_frame(entry, feature_names, start_seconds, features)
+
+def extract_corpus_features(root: str, extractor: Optional[SpectralFeatureExtractor] = None,
+                            window_seconds: Optional[float] = None, hop_seconds: Optional[float] = None,
+                            workers: Optional[int] = None) -> pd.DataFrame:
+    extractor = extractor or SpectralFeatureExtractor(shaft_hz=settings.VIBRATION_SHAFT_HZ)
+    frames = list(iter_corpus_features(scan_corpus(root), extractor, window_seconds, hop_seconds, workers))
+    if not frames:
+        return pd.DataFrame(columns=METADATA_COLUMNS + extractor.feature_names)
+
+    df = pd.concat(frames, ignore_index=True)
+    for column in ('path', 'machine_type', 'machine_id', 'label'):
+        df[column] = df[column].astype('category')
+    return df
@@ -0,0 +1,77 @@
+import io
+import struct
+import numpy as np
+from typing import Dict, Any, BinaryIO, Tuple
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+SAMPLE_DTYPES = {
+    (WAVE_FORMAT_PCM, 8): np.dtype(np.uint8),
+    (WAVE_FORMAT_PCM, 16): np.dtype('<i2'),
+    (WAVE_FORMAT_PCM, 32): np.dtype('<i4'),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): np.dtype('<f4'),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): np.dtype('<f8')
+}
+
+def read_wav_header(fh: BinaryIO) -> Dict[str, Any]:
+    riff, _, wave = struct.unpack('<4sI4s', fh.read(12))
+    if riff != b'RIFF' or wave != b'WAVE':
+        raise ValueError("Not a RIFF/WAVE file")
+
+    fmt = None
+    while True:
+        chunk_header = fh.read(8)
+        if len(chunk_header) < 8:
+            raise ValueError("WAV file has no data chunk")
+
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+        if chunk_id == b'fmt ':
+            body = fh.read(chunk_size)
+            format_tag, channels, sample_rate, _, block_align, bits = struct.unpack('<HHIIHH', body[:16])
+            if format_tag == WAVE_FORMAT_EXTENSIBLE:
+                format_tag = struct.unpack('<H', body[24:26])[0]
+            fmt = (format_tag, channels, sample_rate, block_align, bits)
+            if chunk_size % 2:
+                fh.read(1)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAV data chunk precedes fmt chunk")
+            break
+        else:
+            fh.seek(chunk_size + chunk_size % 2, io.SEEK_CUR)
+
+    format_tag, channels, sample_rate, block_align, bits = fmt
+    dtype = SAMPLE_DTYPES.get((format_tag, bits))
+    if dtype is None:
+        raise ValueError(f"Unsupported WAV encoding: format {format_tag}, {bits} bits")
+
+    return {
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "dtype": dtype,
+        "data_offset": fh.tell(),
+        "n_frames": chunk_size // block_align
+    }
+
+def to_float_samples(samples: np.ndarray) -> np.ndarray:
+    if samples.dtype == np.uint8:
+        return (samples.astype(np.float32) - 128) / 128
+    if samples.dtype.kind == 'i':
+        return samples.astype(np.float32) / np.iinfo(samples.dtype).max
+    return samples.astype(np.float32)
+
+def decode_audio(audio_data: bytes, sample_rate: int) -> Tuple[np.ndarray, int]:
+    if audio_data[:4] != b'RIFF':
+        usable = len(audio_data) - len(audio_data) % 2
+        return to_float_samples(np.frombuffer(audio_data[:usable], dtype='<i2')), sample_rate
+
+    header = read_wav_header(io.BytesIO(audio_data))
+    n_frames = min(header["n_frames"], (len(audio_data) - header["data_offset"]) //
+                   (header["dtype"].itemsize * header["channels"]))
+    samples = np.frombuffer(
+        audio_data, dtype=header["dtype"], count=n_frames * header["channels"], offset=header["data_offset"]
+    ).reshape(n_frames, header["channels"])
+
+    return to_float_samples(samples).mean(axis=1), header["sample_rate"]
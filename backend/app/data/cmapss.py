@@ -0,0 +1,98 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from .rolling import group_positions
+
+SETTING_COLUMNS = [f'op_setting_{i}' for i in range(1, 4)]
+SENSOR_COLUMNS = [f'sensor_{i}' for i in range(1, 22)]
+CMAPSS_COLUMNS = ['unit', 'cycle'] + SETTING_COLUMNS + SENSOR_COLUMNS
+CMAPSS_DTYPES = {
+    'unit': np.int32,
+    'cycle': np.int32,
+    **{column: np.float32 for column in SETTING_COLUMNS + SENSOR_COLUMNS}
+}
+
+# Sensors that carry degradation signal; the rest are flat in every C-MAPSS subset.
+INFORMATIVE_SENSORS = [f'sensor_{i}' for i in (2, 3, 4, 7, 8, 9, 11, 12, 13, 14, 15, 17, 20, 21)]
+WINDOW_STATS = ('mean', 'slope')
+WINDOW_FEATURES_VERSION = 1
+
+def read_cmapss(path: str) -> pd.DataFrame:
+    df = pd.read_csv(
+        path, sep=r'\s+', header=None, names=CMAPSS_COLUMNS, usecols=range(len(CMAPSS_COLUMNS)),
+        dtype=CMAPSS_DTYPES, engine='c'
+    )
+    if not (np.diff(df['unit'].to_numpy()) >= 0).all():
+        df = df.sort_values(['unit', 'cycle'], kind='stable', ignore_index=True)
+    return df
+
+def read_rul_targets(path: str) -> np.ndarray:
+    return np.loadtxt(path, dtype=np.int32, ndmin=1)
+
+def add_remaining_useful_life(df: pd.DataFrame, final_rul: Optional[np.ndarray] = None,
+                              rul_cap: Optional[int] = None) -> pd.DataFrame:
+    units = df['unit'].to_numpy()
+    positions = group_positions(units)
+    starts = np.flatnonzero(positions == 0)
+    lengths = np.diff(np.append(starts, len(units)))
+
+    df['cycle'] = (positions + 1).astype(np.int32)
+    rul = np.repeat(lengths, lengths) - 1 - positions
+    if final_rul is not None:
+        if len(final_rul) != len(starts):
+            raise ValueError(f"Got {len(final_rul)} RUL targets for {len(starts)} units")
+        rul = rul + np.repeat(final_rul, lengths)
+    if rul_cap:
+        rul = np.minimum(rul, rul_cap)
+
+    df['remaining_useful_life'] = rul.astype(np.int32)
+    return df
+
+def sliding_windows(values: np.ndarray, units: np.ndarray, window: int,
+                    stride: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    if len(values) < window:
+        return np.empty((0, window) + values.shape[1:], dtype=values.dtype), np.zeros(0, dtype=np.int64)
+
+    windows = np.moveaxis(sliding_window_view(values, window, axis=0), -1, 1)
+    positions = group_positions(units)
+    ends = np.flatnonzero((positions >= window - 1) & ((positions - (window - 1)) % stride == 0))
+    return windows, ends
+
+def window_feature_names(columns: Sequence[str], window: int) -> List[str]:
+    return ['cycle', *columns, *[f'{column}_{stat}_{window}' for stat in WINDOW_STATS for column in columns]]
+
+def build_window_features(df: pd.DataFrame, window: int, stride: int = 1,
+                          columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    columns = list(columns or INFORMATIVE_SENSORS)
+    values = np.ascontiguousarray(df[columns].to_numpy(dtype=np.float32))
+    windows, ends = sliding_windows(values, df['unit'].to_numpy(), window, stride)
+    starts = ends - (window - 1)
+
+    ramp = np.arange(window, dtype=np.float32) - (window - 1) / 2
+    ramp /= np.sum(ramp * ramp) if window > 1 else 1.0
+
+    out = {
+        'unit': df['unit'].to_numpy()[ends],
+        'cycle': df['cycle'].to_numpy()[ends]
+    }
+    for index, column in enumerate(columns):
+        out[column] = values[ends, index]
+    means = windows.mean(axis=1, dtype=np.float64)[starts]
+    slopes = np.einsum('nwk,w->nk', windows, ramp)[starts]
+    for index, column in enumerate(columns):
+        out[f'{column}_mean_{window}'] = means[:, index].astype(np.float32)
+    for index, column in enumerate(columns):
+        out[f'{column}_slope_{window}'] = slopes[:, index].astype(np.float32)
+    if 'remaining_useful_life' in df:
+        out['remaining_useful_life'] = df['remaining_useful_life'].to_numpy()[ends]
+
+    return pd.DataFrame(out)
+
+def window_cache_name(source_path: str, params: Dict[str, Any]) -> str:
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+    return f"cmapss-{stem}-{digest}"
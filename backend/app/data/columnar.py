@@ -0,0 +1,181 @@
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+def source_fingerprint(path: str) -> Dict[str, Any]:
+    stat = os.stat(path)
+    return {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }
+
+def read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        return None
+    return manifest
+
+def read_columnar(directory: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No columnar dataset at {directory}")
+
+    n_rows = manifest["n_rows"]
+    data = {}
+    for column in manifest["columns"]:
+        if columns is not None and column["name"] not in columns:
+            continue
+
+        dtype = np.dtype(column["dtype"])
+        if n_rows:
+            path = os.path.join(directory, column["file"])
+            values = np.asarray(np.memmap(path, dtype=dtype, mode="r", shape=(n_rows,)))
+        else:
+            values = np.empty(0, dtype=dtype)
+
+        if column["kind"] == "categorical":
+            values = pd.Categorical.from_codes(values, categories=column["categories"])
+        elif column["kind"] == "datetime":
+            values = values.view("datetime64[ns]")
+        data[column["name"]] = values
+
+    return pd.DataFrame(data, copy=False)
+
+class ColumnarWriter:
+    def __init__(self, directory: str, metadata: Optional[Dict[str, Any]] = None):
+        self.directory = directory
+        self.staging_directory = f"{directory}.tmp-{os.getpid()}"
+        self.metadata = metadata or {}
+        self.columns: List[Dict[str, Any]] = []
+        self.files = {}
+        self.category_codes: Dict[str, Dict[Any, int]] = {}
+        self.n_rows = 0
+
+        shutil.rmtree(self.staging_directory, ignore_errors=True)
+        os.makedirs(self.staging_directory)
+
+    def append(self, df: pd.DataFrame):
+        if not self.columns:
+            self._init_schema(df)
+        elif list(df.columns) != [column["name"] for column in self.columns]:
+            raise ValueError(f"Chunk columns {list(df.columns)} do not match the dataset schema")
+
+        for column in self.columns:
+            self._encode(column, df[column["name"]]).tofile(self.files[column["name"]])
+        self.n_rows += len(df)
+
+    def close(self) -> Dict[str, Any]:
+        for f in self.files.values():
+            f.close()
+
+        for column in self.columns:
+            if column["kind"] == "categorical":
+                column["categories"] = list(self.category_codes[column["name"]])
+
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "n_rows": self.n_rows,
+            "columns": self.columns,
+            "created_at": datetime.utcnow().isoformat(),
+            **self.metadata
+        }
+        with open(os.path.join(self.staging_directory, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.replace(self.staging_directory, self.directory)
+        return manifest
+
+    def abort(self):
+        for f in self.files.values():
+            f.close()
+        shutil.rmtree(self.staging_directory, ignore_errors=True)
+
+    def _init_schema(self, df: pd.DataFrame):
+        for index, name in enumerate(df.columns):
+            dtype = df[name].dtype
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                kind, dtype = "datetime", "int64"
+            elif pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+                kind, dtype = "numeric", np.dtype(dtype).str
+            else:
+                kind, dtype = "categorical", "int32"
+                self.category_codes[name] = {}
+
+            file_name = f"{index:03d}.bin"
+            self.columns.append({"name": name, "kind": kind, "dtype": dtype, "file": file_name})
+            self.files[name] = open(os.path.join(self.staging_directory, file_name), "wb")
+
+    def _encode(self, column: Dict[str, Any], series: pd.Series) -> np.ndarray:
+        if column["kind"] == "numeric":
+            return np.ascontiguousarray(series.to_numpy(dtype=column["dtype"]))
+        if column["kind"] == "datetime":
+            return pd.to_datetime(series).to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+        codes = self.category_codes[column["name"]]
+        values = pd.Categorical(series)
+        categories = values.categories.tolist()
+        for category in categories:
+            if category not in codes:
+                codes[category] = len(codes)
+
+        mapping = np.array([codes[category] for category in categories], dtype=np.int32)
+        encoded = np.full(len(values), -1, dtype=np.int32)
+        present = values.codes >= 0
+        encoded[present] = mapping[values.codes[present]]
+        return encoded
+
+class ColumnarCache:
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def dataset_dir(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def is_valid(self, name: str, source_path: str, preprocessing_version: int) -> bool:
+        manifest = read_manifest(self.dataset_dir(name))
+        if manifest is None or not os.path.exists(source_path):
+            return False
+
+        return manifest.get("source") == source_fingerprint(source_path) \
+            and manifest.get("preprocessing_version") == preprocessing_version
+
+    def load(self, name: str, source_path: str, preprocessing_version: int) -> Optional[pd.DataFrame]:
+        if not self.is_valid(name, source_path, preprocessing_version):
+            return None
+
+        try:
+            return read_columnar(self.dataset_dir(name))
+        except (OSError, ValueError) as e:
+            print(f"Discarding columnar cache for {name}: {e}")
+            return None
+
+    def writer(self, name: str, source_path: str, preprocessing_version: int) -> ColumnarWriter:
+        return ColumnarWriter(self.dataset_dir(name), metadata={
+            "source": source_fingerprint(source_path),
+            "preprocessing_version": preprocessing_version
+        })
+
+    def store(self, name: str, df: pd.DataFrame, source_path: str, preprocessing_version: int) -> pd.DataFrame:
+        writer = self.writer(name, source_path, preprocessing_version)
+        try:
+            writer.append(df)
+        except Exception:
+            writer.abort()
+            raise
+        writer.close()
+        return read_columnar(self.dataset_dir(name))
@@ -2,28 +2,176 @@ import pandas as pd
 import numpy as np
 import requests
 from io import StringIO
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Iterator, Optional, Callable, Sequence
 import os
+from ..config import settings
+from .columnar import ColumnarCache, read_columnar, source_fingerprint
+from .acoustic import extract_corpus_features
+from .cmapss import (
+    read_cmapss, read_rul_targets, add_remaining_useful_life, build_window_features,
+    window_cache_name, INFORMATIVE_SENSORS, WINDOW_FEATURES_VERSION
+)
+from .rolling import group_positions, grouped_rolling_stats
+
+FAILURE_WINDOW = 10
+HIGH_TEMPERATURE = 80
+HIGH_VIBRATION = 0.7
+
+PREPROCESSING_VERSIONS = {
+    'sensor_faults': 1,
+    'failure_data': 2,
+    'vibration_data': 2
+}
+CATEGORICAL_COLUMNS = ('machine_id', 'bearing_condition')
+DATETIME_COLUMNS = ('timestamp',)
+
+CSV_DTYPES = {
+    'sensor_faults': {
+        'temperature': np.float32,
+        'vibration': np.float32,
+        'pressure': np.float32,
+        'power_consumption': np.float32,
+        'is_anomaly': 'Int8'
+    },
+    'failure_data': {
+        'machine_id': str,
+        'cycle': 'Int32',
+        'temperature': np.float32,
+        'vibration': np.float32,
+        'pressure': np.float32,
+        'power_consumption': np.float32,
+        'failure_probability': np.float32,
+        'remaining_useful_life': 'Int32'
+    },
+    'vibration_data': {
+        'vibration_amplitude': np.float32,
+        'is_faulty': 'Int8',
+        'bearing_condition': str,
+        'frequency_hz': np.float32
+    }
+}
+CSV_DATE_COLUMNS = {
+    'sensor_faults': ['timestamp'],
+    'failure_data': [],
+    'vibration_data': ['timestamp']
+}
 
 class DatasetLoader:
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
         self.datasets = {}
         self.data_dir = "data/raw"
         os.makedirs(self.data_dir, exist_ok=True)
         
+        self.cache = None
+        if settings.DATASET_CACHE_ENABLED:
+            self.cache = ColumnarCache(cache_dir or settings.DATASET_CACHE_DIR)
+        
     async def load_sensor_faults_dataset(self) -> pd.DataFrame:
-        file_path = os.path.join(self.data_dir, 'sensor_faults.csv')
+        df = self._load_dataset('sensor_faults', self._generate_sensor_faults_data, self._preprocess_sensor_faults)
+        self.datasets['sensor_faults'] = df
+        return df
+    
+    def _load_dataset(self, name: str, generate: Callable[[], pd.DataFrame],
+                      preprocess: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None) -> pd.DataFrame:
+        file_path = os.path.join(self.data_dir, f'{name}.csv')
+        version = PREPROCESSING_VERSIONS[name]
+        
+        if self.cache is not None:
+            df = self.cache.load(name, file_path, version)
+            if df is not None:
+                return df
+            
+            if os.path.exists(file_path) and \
+                    os.path.getsize(file_path) >= settings.DATASET_STREAM_MIN_FILE_MB * 1024 * 1024:
+                return self.stream_to_cache(name)
         
         if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
+            df = pd.read_csv(file_path, dtype=CSV_DTYPES[name])
         else:
-            df = self._generate_sensor_faults_data()
+            df = generate()
             df.to_csv(file_path, index=False)
         
-        df = self._preprocess_sensor_faults(df)
-        self.datasets['sensor_faults'] = df
+        if preprocess is not None:
+            df = preprocess(df)
+        df = self._compact_dtypes(df)
+        
+        if self.cache is not None:
+            df = self.cache.store(name, df, file_path, version)
         return df
     
+    def iter_dataset_chunks(self, name: str, chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        file_path = os.path.join(self.data_dir, f'{name}.csv')
+        reader = pd.read_csv(
+            file_path,
+            dtype=CSV_DTYPES[name],
+            parse_dates=CSV_DATE_COLUMNS[name],
+            chunksize=chunk_rows or settings.DATASET_STREAM_CHUNK_ROWS
+        )
+        
+        with reader:
+            if name == 'sensor_faults':
+                chunks = (self._preprocess_sensor_faults(chunk) for chunk in reader)
+            elif name == 'failure_data':
+                chunks = self._preprocess_failure_chunks(reader)
+            else:
+                chunks = (self._preprocess_vibration_data(chunk) for chunk in reader)
+            
+            for chunk in chunks:
+                yield self._compact_dtypes(chunk)
+    
+    def stream_to_cache(self, name: str, chunk_rows: Optional[int] = None) -> pd.DataFrame:
+        file_path = os.path.join(self.data_dir, f'{name}.csv')
+        cache = self.cache or ColumnarCache(settings.DATASET_CACHE_DIR)
+        writer = cache.writer(name, file_path, PREPROCESSING_VERSIONS[name])
+        
+        try:
+            for chunk in self.iter_dataset_chunks(name, chunk_rows):
+                writer.append(chunk)
+        except Exception:
+            writer.abort()
+            raise
+        
+        writer.close()
+        return read_columnar(cache.dataset_dir(name))
+    
+    def _preprocess_failure_chunks(self, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        carry = None
+        
+        for chunk in chunks:
+            history = None
+            if carry is not None:
+                in_chunk = carry['machine_id'].isin(chunk['machine_id'].unique())
+                history = carry[in_chunk]
+                carry = carry[~in_chunk]
+                chunk = pd.concat([history, chunk])
+            
+            processed = self._preprocess_failure_data(chunk)
+            tail = processed[chunk.columns].groupby('machine_id', sort=False).tail(FAILURE_WINDOW - 1)
+            carry = tail if carry is None else pd.concat([carry, tail])
+            
+            if history is not None:
+                processed = processed[~processed.index.isin(history.index)]
+            yield processed
+    
+    def _compact_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        columns = {}
+        for column in df.columns:
+            if column in CATEGORICAL_COLUMNS:
+                columns[column] = df[column].astype('category')
+            elif column in DATETIME_COLUMNS:
+                columns[column] = pd.to_datetime(df[column])
+            elif pd.api.types.is_float_dtype(df[column]):
+                columns[column] = df[column].astype(np.float32)
+            elif isinstance(df[column].dtype, pd.api.extensions.ExtensionDtype) and \
+                    pd.api.types.is_integer_dtype(df[column]):
+                # Nullable ints from read_csv; preprocessing drops rows with gaps in them.
+                if df[column].isna().any():
+                    columns[column] = df[column].astype(np.float32)
+                else:
+                    columns[column] = df[column].astype(df[column].dtype.numpy_dtype)
+        
+        return df.assign(**columns)
+    
     def _generate_sensor_faults_data(self) -> pd.DataFrame:
         n_samples = 10000
         
@@ -66,71 +214,75 @@ class DatasetLoader:
         return df
     
     async def load_failure_dataset(self) -> pd.DataFrame:
-        file_path = os.path.join(self.data_dir, 'failure_data.csv')
-        
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-        else:
-            df = self._generate_failure_data()
-            df.to_csv(file_path, index=False)
-        
-        df = self._preprocess_failure_data(df)
+        df = self._load_dataset('failure_data', self._generate_failure_data, self._preprocess_failure_data)
         self.datasets['failure_data'] = df
         return df
     
-    def _generate_failure_data(self) -> pd.DataFrame:
-        n_machines = 500
-        
-        np.random.seed(42)
+    def _generate_failure_data(self, n_machines: int = 500, cycle_range: Tuple[int, int] = (50, 200),
+                               seed: int = 42) -> pd.DataFrame:
+        return pd.concat(
+            self.iter_failure_data_chunks(n_machines, cycle_range, seed=seed),
+            ignore_index=True
+        )
+    
+    def iter_failure_data_chunks(self, n_machines: int = 500, cycle_range: Tuple[int, int] = (50, 200),
+                                 machines_per_chunk: Optional[int] = None,
+                                 seed: int = 42) -> Iterator[pd.DataFrame]:
+        rng = np.random.default_rng(seed)
+        n_cycles = rng.integers(cycle_range[0], cycle_range[1], size=n_machines)
+        machines_per_chunk = machines_per_chunk or n_machines
         
-        data = []
-        for i in range(n_machines):
-            n_cycles = np.random.randint(50, 200)
+        for first in range(0, n_machines, machines_per_chunk):
+            chunk_cycles = n_cycles[first:first + machines_per_chunk]
+            n_rows = int(chunk_cycles.sum())
+            
+            machine_index = np.repeat(np.arange(len(chunk_cycles)), chunk_cycles)
+            row_starts = np.repeat(np.cumsum(chunk_cycles) - chunk_cycles, chunk_cycles)
+            cycle = np.arange(n_rows) - row_starts
+            lifetime = chunk_cycles[machine_index]
+            progress = cycle / np.maximum(lifetime - 1, 1)
             
-            temp_trend = np.linspace(60, 90, n_cycles) + np.random.normal(0, 5, n_cycles)
-            vibe_trend = np.linspace(0.3, 0.8, n_cycles) + np.random.normal(0, 0.1, n_cycles)
+            machine_ids = np.array(
+                [f'M{i:04d}' for i in range(first, first + len(chunk_cycles))], dtype=object
+            )
             
-            for cycle in range(n_cycles):
-                failure_prob = min(1.0, cycle / n_cycles * 1.2)
-                
-                data.append({
-                    'machine_id': f'M{i:04d}',
-                    'cycle': cycle,
-                    'temperature': temp_trend[cycle],
-                    'vibration': vibe_trend[cycle],
-                    'pressure': np.random.normal(60, 10),
-                    'power_consumption': np.random.normal(50, 15),
-                    'failure_probability': failure_prob,
-                    'remaining_useful_life': n_cycles - cycle
-                })
-        
-        return pd.DataFrame(data)
+            yield pd.DataFrame({
+                'machine_id': machine_ids[machine_index],
+                'cycle': cycle,
+                'temperature': 60 + 30 * progress + rng.normal(0, 5, n_rows),
+                'vibration': 0.3 + 0.5 * progress + rng.normal(0, 0.1, n_rows),
+                'pressure': rng.normal(60, 10, n_rows),
+                'power_consumption': rng.normal(50, 15, n_rows),
+                'failure_probability': np.minimum(1.0, cycle / lifetime * 1.2),
+                'remaining_useful_life': lifetime - cycle
+            })
     
     def _preprocess_failure_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Rows without a cycle or target cannot be windowed or trained on.
+        df = df.dropna(subset=['machine_id', 'cycle', 'remaining_useful_life'])
         df = df.sort_values(['machine_id', 'cycle'])
         
-        df['temperature_mean'] = df.groupby('machine_id')['temperature'].transform(lambda x: x.rolling(10, min_periods=1).mean())
-        df['temperature_std'] = df.groupby('machine_id')['temperature'].transform(lambda x: x.rolling(10, min_periods=1).std().fillna(0))
-        df['temperature_max'] = df.groupby('machine_id')['temperature'].transform(lambda x: x.rolling(10, min_periods=1).max())
+        positions = group_positions(df['machine_id'].to_numpy())
+        counts = {}
         
-        df['vibration_mean'] = df.groupby('machine_id')['vibration'].transform(lambda x: x.rolling(10, min_periods=1).mean())
-        df['vibration_std'] = df.groupby('machine_id')['vibration'].transform(lambda x: x.rolling(10, min_periods=1).std().fillna(0))
-        df['vibration_max'] = df.groupby('machine_id')['vibration'].transform(lambda x: x.rolling(10, min_periods=1).max())
+        for column, count_name, threshold in [('temperature', 'high_temp_count', HIGH_TEMPERATURE),
+                                              ('vibration', 'high_vibe_count', HIGH_VIBRATION)]:
+            rolled = grouped_rolling_stats(
+                df[column].to_numpy(), positions, FAILURE_WINDOW,
+                stats=('mean', 'std', 'max'), thresholds={count_name: threshold}
+            )
+            df[f'{column}_mean'] = rolled['mean']
+            df[f'{column}_std'] = np.nan_to_num(rolled['std'])
+            df[f'{column}_max'] = rolled['max']
+            counts[count_name] = rolled[count_name]
         
-        df['high_temp_count'] = df.groupby('machine_id')['temperature'].transform(lambda x: (x.rolling(10, min_periods=1).apply(lambda y: (y > 80).sum())))
-        df['high_vibe_count'] = df.groupby('machine_id')['vibration'].transform(lambda x: (x.rolling(10, min_periods=1).apply(lambda y: (y > 0.7).sum())))
+        for count_name, values in counts.items():
+            df[count_name] = values
         
         return df
     
     async def load_vibration_dataset(self) -> pd.DataFrame:
-        file_path = os.path.join(self.data_dir, 'vibration_data.csv')
-        
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-        else:
-            df = self._generate_vibration_data()
-            df.to_csv(file_path, index=False)
-        
+        df = self._load_dataset('vibration_data', self._generate_vibration_data, self._preprocess_vibration_data)
         self.datasets['vibration_data'] = df
         return df
     
@@ -157,6 +309,65 @@ class DatasetLoader:
         
         return df
     
+    def _preprocess_vibration_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.dropna(subset=['is_faulty'])
+    
+    async def load_acoustic_features(self, corpus_dir: Optional[str] = None,
+                                     window_seconds: Optional[float] = None,
+                                     workers: Optional[int] = None) -> pd.DataFrame:
+        corpus_dir = corpus_dir or settings.ACOUSTIC_CORPUS_DIR
+        if not os.path.isdir(corpus_dir):
+            raise FileNotFoundError(f"Acoustic corpus directory {corpus_dir} does not exist")
+        
+        df = extract_corpus_features(corpus_dir, window_seconds=window_seconds, workers=workers)
+        self.datasets['acoustic_features'] = df
+        return df
+    
+    async def load_cmapss_dataset(self, subset: str = 'FD001', split: str = 'train') -> pd.DataFrame:
+        df = self._read_cmapss_split(subset, split)
+        self.datasets[f'cmapss_{split}_{subset}'] = df
+        return df
+    
+    async def load_cmapss_windows(self, subset: str = 'FD001', split: str = 'train',
+                                  window: Optional[int] = None, stride: Optional[int] = None,
+                                  columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        window = window or settings.CMAPSS_WINDOW
+        stride = stride or settings.CMAPSS_WINDOW_STRIDE
+        columns = list(columns or INFORMATIVE_SENSORS)
+        data_path = os.path.join(settings.CMAPSS_DATA_DIR, f'{split}_{subset}.txt')
+        
+        rul_path = os.path.join(settings.CMAPSS_DATA_DIR, f'RUL_{subset}.txt')
+        name = window_cache_name(data_path, {
+            "window": window,
+            "stride": stride,
+            "columns": columns,
+            "rul_cap": settings.CMAPSS_RUL_CAP,
+            "targets": source_fingerprint(rul_path) if split == 'test' and os.path.exists(rul_path) else None
+        })
+        if self.cache is not None:
+            df = self.cache.load(name, data_path, WINDOW_FEATURES_VERSION)
+            if df is not None:
+                self.datasets[f'cmapss_windows_{split}_{subset}'] = df
+                return df
+        
+        df = build_window_features(self._read_cmapss_split(subset, split), window, stride, columns)
+        if self.cache is not None:
+            df = self.cache.store(name, df, data_path, WINDOW_FEATURES_VERSION)
+        
+        self.datasets[f'cmapss_windows_{split}_{subset}'] = df
+        return df
+    
+    def _read_cmapss_split(self, subset: str, split: str) -> pd.DataFrame:
+        data_path = os.path.join(settings.CMAPSS_DATA_DIR, f'{split}_{subset}.txt')
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"C-MAPSS file {data_path} does not exist")
+        
+        final_rul = None
+        if split == 'test':
+            final_rul = read_rul_targets(os.path.join(settings.CMAPSS_DATA_DIR, f'RUL_{subset}.txt'))
+        
+        return add_remaining_useful_life(read_cmapss(data_path), final_rul, settings.CMAPSS_RUL_CAP or None)
+    
     async def load_all_datasets(self) -> Dict[str, pd.DataFrame]:
         sensor_faults = await self.load_sensor_faults_dataset()
         failure_data = await self.load_failure_dataset()
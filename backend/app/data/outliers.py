@@ -0,0 +1,187 @@
+import json
+import os
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from datetime import datetime
+from ..config import settings
+from .processors import SENSOR_COLUMNS
+from .rolling import group_positions
+
+MAD_TO_STD = 1.4826
+MIN_SCALE = 1e-9
+
+class StreamingOutlierDetector:
+    def __init__(self, columns: Optional[List[str]] = None, halflife: Optional[float] = None,
+                 threshold: Optional[float] = None, warmup: Optional[int] = None,
+                 robust: Optional[bool] = None, capacity: int = 1024):
+        self.columns = list(columns or SENSOR_COLUMNS)
+        self.halflife = halflife or settings.OUTLIER_HALFLIFE_READINGS
+        self.threshold = threshold or settings.OUTLIER_Z_THRESHOLD
+        self.warmup = settings.OUTLIER_WARMUP_READINGS if warmup is None else warmup
+        self.robust = settings.OUTLIER_ROBUST if robust is None else robust
+        self.alpha = 1 - 0.5 ** (1 / self.halflife)
+
+        self.machine_ids: List[Any] = []
+        self.machine_index: Dict[Any, int] = {}
+        shape = (capacity, len(self.columns))
+        self.mean = np.zeros(shape)
+        self.var = np.zeros(shape)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.median = np.zeros(shape)
+        self.mad = np.zeros(shape)
+
+        self.readings_processed = 0
+        self.outliers_flagged = 0
+
+    def update(self, machine_id: Any, reading: Dict[str, float]) -> Dict[str, Any]:
+        values = np.array([[reading.get(col, np.nan) for col in self.columns]], dtype=np.float64)
+        scores, flags = self.update_batch([machine_id], values)
+
+        return {
+            "machine_id": machine_id,
+            "is_outlier": bool(flags[0].any()),
+            "outliers": [col for col, flag in zip(self.columns, flags[0]) if flag],
+            "scores": {col: float(score) for col, score in zip(self.columns, scores[0]) if not np.isnan(score)}
+        }
+
+    def update_batch(self, machine_ids: Sequence[Any], values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(values, dtype=np.float64).reshape(len(machine_ids), len(self.columns))
+        rows = self._rows(machine_ids)
+        scores = np.full(values.shape, np.nan)
+        flags = np.zeros(values.shape, dtype=bool)
+        if not len(rows):
+            return scores, flags
+
+        if len(rows) == 1:
+            scores, flags = self._score_and_update(rows, values)
+        else:
+            order = np.argsort(rows, kind='stable')
+            rounds = np.empty(len(rows), dtype=np.int64)
+            rounds[order] = group_positions(rows[order])
+
+            for round_number in range(rounds.max() + 1):
+                batch = np.flatnonzero(rounds == round_number)
+                scores[batch], flags[batch] = self._score_and_update(rows[batch], values[batch])
+
+        self.readings_processed += len(rows)
+        self.outliers_flagged += int(flags.any(axis=1).sum())
+        return scores, flags
+
+    def _score_and_update(self, rows: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        mean = self.mean[rows]
+        var = self.var[rows]
+        count = self.count[rows]
+        median = self.median[rows]
+        mad = self.mad[rows]
+        present = ~np.isnan(x)
+
+        if self.robust:
+            deviation = np.abs(x - median)
+            scale = MAD_TO_STD * mad
+        else:
+            deviation = np.abs(x - mean)
+            scale = np.sqrt(var)
+        ready = present & (count >= self.warmup)
+        scores = np.where(ready, deviation / np.maximum(scale, MIN_SCALE), np.nan)
+        flags = ready & (scores > self.threshold)
+
+        alpha = np.maximum(self.alpha, 1.0 / (count + 1))
+        diff = np.where(present, x - mean, 0.0)
+        increment = alpha * diff
+        new_mean = mean + increment
+        new_var = np.where(present, (1 - alpha) * (var + diff * increment), var)
+
+        step = alpha * np.sqrt(new_var)
+        new_median = np.where(count == 0, x, median + step * np.sign(x - median))
+        new_mad = np.where(count == 0, 0.0, mad + step * np.sign(np.abs(x - new_median) - mad))
+
+        self.mean[rows] = new_mean
+        self.var[rows] = new_var
+        self.median[rows] = np.where(present, new_median, median)
+        self.mad[rows] = np.where(present, np.maximum(new_mad, 0.0), mad)
+        self.count[rows] = count + present
+        return scores, flags
+
+    def _rows(self, machine_ids: Sequence[Any]) -> np.ndarray:
+        rows = np.empty(len(machine_ids), dtype=np.int64)
+        for i, machine_id in enumerate(machine_ids):
+            row = self.machine_index.get(machine_id)
+            if row is None:
+                row = self._add_machine(machine_id)
+            rows[i] = row
+        return rows
+
+    def _add_machine(self, machine_id: Any) -> int:
+        row = len(self.machine_ids)
+        if row == len(self.mean):
+            for name in ('mean', 'var', 'count', 'median', 'mad'):
+                state = getattr(self, name)
+                grown = np.zeros((max(2 * len(state), 1), state.shape[1]), dtype=state.dtype)
+                grown[:len(state)] = state
+                setattr(self, name, grown)
+
+        self.machine_ids.append(machine_id)
+        self.machine_index[machine_id] = row
+        return row
+
+    def save(self, path: str):
+        n_machines = len(self.machine_ids)
+        config = {
+            "columns": self.columns,
+            "halflife": self.halflife,
+            "threshold": self.threshold,
+            "warmup": self.warmup,
+            "robust": self.robust,
+            "machine_ids": self.machine_ids,
+            "readings_processed": self.readings_processed,
+            "outliers_flagged": self.outliers_flagged,
+            "saved_at": datetime.utcnow().isoformat()
+        }
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fh:
+            np.savez(
+                fh,
+                config=np.array(json.dumps(config)),
+                mean=self.mean[:n_machines],
+                var=self.var[:n_machines],
+                count=self.count[:n_machines],
+                median=self.median[:n_machines],
+                mad=self.mad[:n_machines]
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "StreamingOutlierDetector":
+        with np.load(path, allow_pickle=False) as state:
+            config = json.loads(str(state["config"]))
+            detector = cls(
+                columns=config["columns"],
+                halflife=config["halflife"],
+                threshold=config["threshold"],
+                warmup=config["warmup"],
+                robust=config["robust"],
+                capacity=max(len(config["machine_ids"]), 1)
+            )
+            n_machines = len(config["machine_ids"])
+            for name in ('mean', 'var', 'count', 'median', 'mad'):
+                getattr(detector, name)[:n_machines] = state[name]
+
+        detector.machine_ids = list(config["machine_ids"])
+        detector.machine_index = {machine_id: row for row, machine_id in enumerate(detector.machine_ids)}
+        detector.readings_processed = config["readings_processed"]
+        detector.outliers_flagged = config["outliers_flagged"]
+        return detector
+
+    def get_detector_stats(self) -> Dict[str, Any]:
+        return {
+            "machines": len(self.machine_ids),
+            "columns": self.columns,
+            "halflife": self.halflife,
+            "threshold": self.threshold,
+            "robust": self.robust,
+            "readings_processed": self.readings_processed,
+            "outliers_flagged": self.outliers_flagged,
+            "outlier_rate": self.outliers_flagged / self.readings_processed if self.readings_processed else 0.0,
+            "timestamp": datetime.utcnow().isoformat()
+        }
@@ -1,7 +1,15 @@
+import json
+import math
+import os
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
+from .rolling import group_positions, grouped_multi_window_stats
+
+SENSOR_COLUMNS = ['temperature', 'vibration', 'pressure', 'power_consumption']
+FLEET_WINDOW_STATS = ('mean', 'std', 'max', 'min')
 
 class DataProcessor:
     def __init__(self):
@@ -37,6 +45,34 @@ class DataProcessor:
         
         return features
     
+    def extract_fleet_features(self, df: pd.DataFrame, window_sizes: Tuple[int, ...] = (5, 10, 60),
+                               columns: Optional[List[str]] = None) -> pd.DataFrame:
+        sort_keys = [key for key in ('machine_id', 'timestamp') if key in df.columns]
+        features = df.sort_values(sort_keys, kind='stable') if sort_keys else df.copy()
+        
+        if 'machine_id' in features.columns:
+            positions = group_positions(features['machine_id'].to_numpy())
+        else:
+            positions = np.arange(len(features))
+        
+        new_columns = {}
+        for col in columns or SENSOR_COLUMNS:
+            if col not in features.columns:
+                continue
+            
+            rolled = grouped_multi_window_stats(
+                features[col].to_numpy(), positions, window_sizes, FLEET_WINDOW_STATS, dtype=np.float32
+            )
+            for window in window_sizes:
+                stats = rolled[window]
+                new_columns[f'{col}_mean_{window}'] = stats['mean']
+                new_columns[f'{col}_std_{window}'] = np.nan_to_num(stats['std'])
+                new_columns[f'{col}_max_{window}'] = stats['max']
+                new_columns[f'{col}_min_{window}'] = stats['min']
+                new_columns[f'{col}_range_{window}'] = stats['max'] - stats['min']
+        
+        return features.assign(**new_columns)
+    
     def detect_outliers(self, df: pd.DataFrame, column: str, threshold: float = 3.0) -> pd.Series:
         mean = df[column].mean()
         std = df[column].std()
@@ -64,7 +100,11 @@ class DataProcessor:
         
         return df
     
-    def normalize_features(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    def normalize_features(self, df: pd.DataFrame, columns: List[str],
+                           normalizer: Optional['FittedNormalizer'] = None) -> pd.DataFrame:
+        if normalizer is not None:
+            return normalizer.transform(df)
+        
         normalized = df.copy()
         
         for col in columns:
@@ -91,4 +131,219 @@ class DataProcessor:
         df['is_weekend'] = df['day_of_week'].isin([5, 6]).astype(int)
         df['is_business_hours'] = df['hour'].between(8, 17).astype(int)
         
-        return df
\ No newline at end of file
+        return df
+
+class FittedNormalizer:
+    def __init__(self, columns: Optional[List[str]] = None, clip: bool = False):
+        self.columns = list(columns or [])
+        self.clip = clip
+        self.minimum = np.zeros(len(self.columns))
+        self.maximum = np.zeros(len(self.columns))
+        self.fitted = False
+    
+    def fit(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> 'FittedNormalizer':
+        self.columns = [col for col in (columns or self.columns) if col in df.columns]
+        self.minimum = np.array([df[col].min() for col in self.columns], dtype=np.float64)
+        self.maximum = np.array([df[col].max() for col in self.columns], dtype=np.float64)
+        self.fitted = True
+        return self
+    
+    @property
+    def scale(self) -> np.ndarray:
+        spread = self.maximum - self.minimum
+        return np.divide(1.0, spread, out=np.zeros_like(spread), where=spread > 0)
+    
+    def transform(self, df: pd.DataFrame, out: Optional[np.ndarray] = None) -> Union[pd.DataFrame, np.ndarray]:
+        self._check_fitted()
+        if out is not None:
+            for j, col in enumerate(self.columns):
+                self._transform_column(df[col].to_numpy(), j, out[:, j])
+            return out
+        
+        for j, col in enumerate(self.columns):
+            if col in df.columns:
+                df[col] = self._transform_column(df[col].to_numpy(), j, np.empty(len(df), dtype=np.float32))
+        return df
+    
+    def transform_array(self, values: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        self._check_fitted()
+        if out is None:
+            out = np.empty(values.shape, dtype=np.float32)
+        
+        np.subtract(values, self.minimum, out=out, casting='unsafe')
+        np.multiply(out, self.scale, out=out, casting='unsafe')
+        if self.clip:
+            np.clip(out, 0, 1, out=out)
+        return out
+    
+    def _transform_column(self, values: np.ndarray, j: int, out: np.ndarray) -> np.ndarray:
+        np.subtract(values, self.minimum[j], out=out, casting='unsafe')
+        np.multiply(out, self.scale[j], out=out, casting='unsafe')
+        if self.clip:
+            np.clip(out, 0, 1, out=out)
+        return out
+    
+    def _check_fitted(self):
+        if not self.fitted:
+            raise ValueError("Normalizer has not been fitted")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "columns": self.columns,
+            "clip": self.clip,
+            "minimum": self.minimum.tolist(),
+            "maximum": self.maximum.tolist()
+        }
+    
+    @classmethod
+    def from_dict(cls, params: Dict[str, Any]) -> 'FittedNormalizer':
+        normalizer = cls(params["columns"], clip=params.get("clip", False))
+        normalizer.minimum = np.array(params["minimum"], dtype=np.float64)
+        normalizer.maximum = np.array(params["maximum"], dtype=np.float64)
+        normalizer.fitted = True
+        return normalizer
+    
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'FittedNormalizer':
+        with open(path) as fh:
+            return cls.from_dict(json.load(fh))
+
+class RollingWindow:
+    __slots__ = ('size', 'values', 'count', 'position', 'mean', 'm2', 'pushes',
+                 'track_extrema', 'max_deque', 'min_deque', 'resync_interval')
+    
+    def __init__(self, size: int, track_extrema: bool = False, resync_interval: int = 1024):
+        self.size = size
+        self.values = [0.0] * size
+        self.count = 0
+        self.position = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.pushes = 0
+        self.track_extrema = track_extrema
+        self.max_deque = deque()
+        self.min_deque = deque()
+        self.resync_interval = resync_interval
+    
+    def push(self, value: float):
+        if self.count == self.size:
+            old = self.values[self.position]
+            old_mean = self.mean
+            self.mean += (value - old) / self.count
+            self.m2 += (value - old) * (value - self.mean + old - old_mean)
+        else:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+        
+        self.values[self.position] = value
+        self.position = (self.position + 1) % self.size
+        self.pushes += 1
+        
+        if self.pushes % self.resync_interval == 0:
+            self._resync()
+        
+        if self.track_extrema:
+            expired = self.pushes - self.size
+            
+            while self.max_deque and self.max_deque[-1][1] <= value:
+                self.max_deque.pop()
+            self.max_deque.append((self.pushes, value))
+            if self.max_deque[0][0] <= expired:
+                self.max_deque.popleft()
+            
+            while self.min_deque and self.min_deque[-1][1] >= value:
+                self.min_deque.pop()
+            self.min_deque.append((self.pushes, value))
+            if self.min_deque[0][0] <= expired:
+                self.min_deque.popleft()
+    
+    def std(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+    
+    def _resync(self):
+        window = self.values[:self.count] if self.count < self.size else self.values
+        self.mean = math.fsum(window) / self.count
+        self.m2 = math.fsum((value - self.mean) ** 2 for value in window)
+
+class StreamingSensorProcessor:
+    def __init__(self, columns: Optional[List[str]] = None, short_window: int = 5,
+                 feature_window: int = 10, resync_interval: int = 1024):
+        self.columns = columns or SENSOR_COLUMNS
+        self.short_window = short_window
+        self.feature_window = feature_window
+        self.resync_interval = resync_interval
+        self.machines: Dict[Any, Dict[str, Tuple[RollingWindow, RollingWindow]]] = {}
+        self.readings_processed = 0
+        
+        self.output_names = {
+            col: tuple(f'{col}{suffix}' for suffix in (
+                f'_ma{short_window}', f'_std{short_window}', '_mean', '_std', '_max', '_min', '_range'
+            ))
+            for col in self.columns
+        }
+    
+    def process_reading(self, reading: Dict[str, Any]) -> Dict[str, Any]:
+        windows = self.machines.get(reading.get('machine_id'))
+        if windows is None:
+            windows = self.machines[reading.get('machine_id')] = {}
+        
+        result = dict(reading)
+        for col in self.columns:
+            value = reading.get(col)
+            if value is None:
+                continue
+            value = float(value)
+            if not math.isfinite(value):
+                # A NaN would stay in the running mean/m2 until the next resync.
+                continue
+            
+            if col not in windows:
+                windows[col] = (
+                    RollingWindow(self.short_window, resync_interval=self.resync_interval),
+                    RollingWindow(self.feature_window, track_extrema=True, resync_interval=self.resync_interval)
+                )
+            short, feature = windows[col]
+            short.push(value)
+            feature.push(value)
+            
+            ma_name, std_short_name, mean_name, std_name, max_name, min_name, range_name = self.output_names[col]
+            window_max = feature.max_deque[0][1]
+            window_min = feature.min_deque[0][1]
+            result[ma_name] = short.mean
+            result[std_short_name] = short.std()
+            result[mean_name] = feature.mean
+            result[std_name] = feature.std()
+            result[max_name] = window_max
+            result[min_name] = window_min
+            result[range_name] = window_max - window_min
+        
+        self.readings_processed += 1
+        return result
+    
+    def process_readings(self, readings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.process_reading(reading) for reading in readings]
+    
+    def reset(self, machine_id: Any = None):
+        if machine_id is None:
+            self.machines.clear()
+        else:
+            self.machines.pop(machine_id, None)
+    
+    def get_processor_stats(self) -> Dict[str, Any]:
+        return {
+            "machines": len(self.machines),
+            "readings_processed": self.readings_processed,
+            "short_window": self.short_window,
+            "feature_window": self.feature_window,
+            "timestamp": datetime.utcnow().isoformat()
+        }
@@ -0,0 +1,121 @@
+import numpy as np
+from typing import Dict, Iterable, Optional, Sequence
+
+CHUNK_ROWS = 1 << 12
+CANCELLATION_TOLERANCE = 1e-6
+
+def group_positions(keys: np.ndarray) -> np.ndarray:
+    keys = np.asarray(keys)
+    n_rows = len(keys)
+    if n_rows == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    starts = np.empty(n_rows, dtype=bool)
+    starts[0] = True
+    starts[1:] = keys[1:] != keys[:-1]
+
+    index = np.arange(n_rows)
+    return index - np.maximum.accumulate(np.where(starts, index, 0))
+
+def grouped_rolling_stats(values: np.ndarray, positions: np.ndarray, window: int,
+                          stats: Iterable[str] = ('mean', 'std', 'max', 'min'),
+                          thresholds: Optional[Dict[str, float]] = None,
+                          dtype=np.float64, chunk_rows: int = CHUNK_ROWS) -> Dict[str, np.ndarray]:
+    return grouped_multi_window_stats(values, positions, [window], stats, thresholds, dtype, chunk_rows)[window]
+
+def grouped_multi_window_stats(values: np.ndarray, positions: np.ndarray, windows: Sequence[int],
+                               stats: Iterable[str] = ('mean', 'std', 'max', 'min'),
+                               thresholds: Optional[Dict[str, float]] = None,
+                               dtype=np.float64, chunk_rows: int = CHUNK_ROWS) -> Dict[int, Dict[str, np.ndarray]]:
+    stats = tuple(stats)
+    thresholds = thresholds or {}
+    values = np.asarray(values, dtype=np.float64)
+    positions = np.asarray(positions)
+    n_rows = len(values)
+    largest = max(windows)
+
+    outputs = {
+        window: {name: np.empty(n_rows, dtype=dtype) for name in (*stats, *thresholds)}
+        for window in windows
+    }
+
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        lookbehind = min(start, largest - 1)
+        local = values[start - lookbehind:stop]
+        rows = np.arange(lookbehind, len(local))
+        chunk_positions = positions[start:stop]
+
+        finite = ~np.isnan(local)
+        shift = local[finite].mean() if finite.any() else 0.0
+        centered = np.where(finite, local - shift, 0.0)
+        sums = _prefix_sum(centered)
+        squares = _prefix_sum(centered * centered)
+        counts = _prefix_sum(finite)
+        above = {name: _prefix_sum(local > threshold) for name, threshold in thresholds.items()}
+        extrema = {
+            name: _sparse_table(local, reduce, largest)
+            for name, reduce in (('max', np.fmax), ('min', np.fmin)) if name in stats
+        }
+
+        for window in windows:
+            first = rows - np.minimum(chunk_positions, window - 1)
+            result = outputs[window]
+
+            n = counts[rows + 1] - counts[first]
+            total = sums[rows + 1] - sums[first]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                if 'mean' in stats:
+                    result['mean'][start:stop] = total / n + shift
+                if 'std' in stats:
+                    raw = squares[rows + 1] - squares[first]
+                    squared = raw - total * total / n
+                    unstable = np.flatnonzero((n > 1) & (squared < CANCELLATION_TOLERANCE * raw))
+                    if len(unstable):
+                        squared[unstable] = _squared_deviations(local, first[unstable], rows[unstable], window)
+                    result['std'][start:stop] = np.where(n > 1, np.sqrt(np.maximum(squared, 0.0) / (n - 1)), np.nan)
+
+            for name, table in extrema.items():
+                result[name][start:stop] = _query_sparse_table(table, first, rows, np.fmax if name == 'max' else np.fmin)
+            for name, prefix in above.items():
+                result[name][start:stop] = np.where(n > 0, prefix[rows + 1] - prefix[first], np.nan)
+
+    return outputs
+
+def _prefix_sum(values: np.ndarray) -> np.ndarray:
+    prefix = np.zeros(len(values) + 1, dtype=np.float64)
+    np.cumsum(values, out=prefix[1:])
+    return prefix
+
+def _squared_deviations(values: np.ndarray, first: np.ndarray, last: np.ndarray, window: int) -> np.ndarray:
+    members = []
+    total = np.zeros(len(first))
+    count = np.zeros(len(first))
+    for offset in range(window):
+        index = np.minimum(first + offset, last)
+        inside = (first + offset <= last) & ~np.isnan(values[index])
+        members.append((index, inside))
+        total += np.where(inside, values[index], 0.0)
+        count += inside
+
+    mean = total / count
+    squared = np.zeros(len(first))
+    for index, inside in members:
+        squared += np.where(inside, (values[index] - mean) ** 2, 0.0)
+    return squared
+
+def _sparse_table(values: np.ndarray, reduce, largest: int) -> np.ndarray:
+    levels = max(1, int(largest).bit_length())
+    table = np.empty((levels, len(values)), dtype=np.float64)
+    table[0] = values
+
+    for level in range(1, levels):
+        span = 1 << (level - 1)
+        table[level, :span] = table[level - 1, :span]
+        reduce(table[level - 1, span:], table[level - 1, :-span], out=table[level, span:])
+
+    return table
+
+def _query_sparse_table(table: np.ndarray, first: np.ndarray, last: np.ndarray, reduce) -> np.ndarray:
+    level = np.log2(last - first + 1).astype(np.int64)
+    return reduce(table[level, last], table[level, first + (1 << level) - 1])
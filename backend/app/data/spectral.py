@@ -0,0 +1,138 @@
+import math
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+SPECTRAL_BANDS_HZ = ((0, 250), (250, 500), (500, 1000), (1000, 2000), (2000, 4000), (4000, 8000))
+ENVELOPE_BAND_HZ = (2000, 7000)
+FAULT_FREQUENCIES = ('bpfo', 'bpfi', 'bsf', 'ftf')
+
+# Deep-groove 6205 bearing, the drive-end bearing of the common lab test rigs.
+BEARING_GEOMETRY = {
+    "n_balls": 9,
+    "ball_diameter": 7.94,
+    "pitch_diameter": 39.04,
+    "contact_angle_deg": 0.0
+}
+
+def bearing_fault_frequencies(shaft_hz: float, n_balls: int, ball_diameter: float, pitch_diameter: float,
+                              contact_angle_deg: float = 0.0) -> Dict[str, float]:
+    ratio = ball_diameter / pitch_diameter * math.cos(math.radians(contact_angle_deg))
+    return {
+        "bpfo": n_balls / 2 * shaft_hz * (1 - ratio),
+        "bpfi": n_balls / 2 * shaft_hz * (1 + ratio),
+        "bsf": pitch_diameter / (2 * ball_diameter) * shaft_hz * (1 - ratio ** 2),
+        "ftf": shaft_hz / 2 * (1 - ratio)
+    }
+
+def welch_psd(clips: np.ndarray, sample_rate: float, segment_length: int = 1024,
+              overlap: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    clips = np.atleast_2d(np.asarray(clips, dtype=np.float32))
+    segment_length = min(segment_length, clips.shape[-1])
+    step = max(1, int(segment_length * (1 - overlap)))
+    window = np.hanning(segment_length + 1)[:-1].astype(np.float32)
+
+    segments = sliding_window_view(clips, segment_length, axis=-1)[:, ::step]
+    segments = (segments - segments.mean(axis=-1, keepdims=True)) * window
+    spectrum = np.fft.rfft(segments, axis=-1)
+
+    psd = (spectrum.real ** 2 + spectrum.imag ** 2).mean(axis=1) / (sample_rate * np.sum(window ** 2))
+    psd[:, 1:] *= 2
+    if segment_length % 2 == 0:
+        psd[:, -1] /= 2
+    return np.fft.rfftfreq(segment_length, 1 / sample_rate), psd
+
+def envelope_spectrum(clips: np.ndarray, sample_rate: float,
+                      band: Tuple[float, float] = ENVELOPE_BAND_HZ) -> Tuple[np.ndarray, np.ndarray]:
+    clips = np.atleast_2d(np.asarray(clips, dtype=np.float32))
+    n_samples = clips.shape[-1]
+    low, high = band
+    high = min(high, 0.45 * sample_rate)
+    if low >= high:
+        low, high = 0.1 * sample_rate, 0.45 * sample_rate
+
+    spectrum = np.fft.rfft(clips, axis=-1)
+    freqs = np.fft.rfftfreq(n_samples, 1 / sample_rate)
+    spectrum[:, (freqs < low) | (freqs > high)] = 0
+
+    analytic = np.zeros((len(clips), n_samples), dtype=np.complex64)
+    analytic[:, :spectrum.shape[1]] = 2 * spectrum
+    envelope = np.abs(np.fft.ifft(analytic, axis=-1)).astype(np.float32)
+    envelope -= envelope.mean(axis=-1, keepdims=True)
+
+    window = np.hanning(n_samples).astype(np.float32)
+    return freqs, np.abs(np.fft.rfft(envelope * window, axis=-1))
+
+class SpectralFeatureExtractor:
+    def __init__(self, segment_length: int = 1024, bands: Sequence[Tuple[float, float]] = SPECTRAL_BANDS_HZ,
+                 envelope_band: Tuple[float, float] = ENVELOPE_BAND_HZ, shaft_hz: Optional[float] = None,
+                 bearing_geometry: Optional[Dict[str, float]] = None, batch_size: int = 64):
+        self.segment_length = segment_length
+        self.bands = list(bands)
+        self.envelope_band = envelope_band
+        self.batch_size = batch_size
+        self.fault_frequencies = bearing_fault_frequencies(shaft_hz, **(bearing_geometry or BEARING_GEOMETRY)) \
+            if shaft_hz else {}
+
+        self.feature_names = [
+            'rms', 'peak', 'crest_factor', 'kurtosis', 'dominant_frequency', 'spectral_centroid',
+            *[f'band_energy_{int(low)}_{int(high)}hz' for low, high in self.bands],
+            *[f'envelope_{name}' for name in FAULT_FREQUENCIES]
+        ]
+
+    def extract(self, clips: np.ndarray, sample_rate: float) -> np.ndarray:
+        clips = np.atleast_2d(np.asarray(clips, dtype=np.float32))
+        if clips.shape[-1] < 2:
+            raise ValueError("Audio clips need at least two samples")
+        features = np.empty((len(clips), len(self.feature_names)), dtype=np.float32)
+
+        for start in range(0, len(clips), self.batch_size):
+            stop = start + self.batch_size
+            features[start:stop] = self._extract_batch(clips[start:stop], sample_rate)
+        return features
+
+    def extract_one(self, signal: np.ndarray, sample_rate: float) -> Dict[str, float]:
+        return dict(zip(self.feature_names, self.extract(signal, sample_rate)[0].tolist()))
+
+    def _extract_batch(self, clips: np.ndarray, sample_rate: float) -> np.ndarray:
+        centered = clips - clips.mean(axis=-1, keepdims=True)
+        variance = np.mean(centered ** 2, axis=-1)
+        rms = np.sqrt(variance)
+        peak = np.max(np.abs(centered), axis=-1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            crest_factor = np.where(rms > 0, peak / rms, 0.0)
+            kurtosis = np.where(variance > 0, np.mean(centered ** 4, axis=-1) / variance ** 2, 0.0)
+
+        freqs, psd = welch_psd(clips, sample_rate, self.segment_length)
+        total_power = psd.sum(axis=-1)
+        safe_total = np.where(total_power > 0, total_power, 1.0)
+        dominant_frequency = freqs[1:][np.argmax(psd[:, 1:], axis=-1)] if len(freqs) > 1 else np.zeros(len(clips))
+        spectral_centroid = (psd * freqs).sum(axis=-1) / safe_total
+        band_energy = [
+            psd[:, (freqs >= low) & (freqs < high)].sum(axis=-1) / safe_total for low, high in self.bands
+        ]
+
+        return np.column_stack([
+            rms, peak, crest_factor, kurtosis, dominant_frequency, spectral_centroid,
+            *band_energy, *self._envelope_indicators(clips, sample_rate)
+        ])
+
+    def _envelope_indicators(self, clips: np.ndarray, sample_rate: float) -> List[np.ndarray]:
+        if not self.fault_frequencies:
+            return [np.zeros(len(clips)) for _ in FAULT_FREQUENCIES]
+
+        freqs, spectrum = envelope_spectrum(clips, sample_rate, self.envelope_band)
+        resolution = freqs[1] - freqs[0]
+        floor = np.median(spectrum[:, 1:], axis=-1)
+        floor = np.where(floor > 0, floor, 1.0)
+
+        indicators = []
+        for name in FAULT_FREQUENCIES:
+            frequency = self.fault_frequencies[name]
+            tolerance = max(2 * resolution, 0.03 * frequency)
+            nearby = (freqs >= frequency - tolerance) & (freqs <= frequency + tolerance)
+            if frequency >= sample_rate / 2 or not nearby.any():
+                indicators.append(np.zeros(len(clips)))
+            else:
+                indicators.append(spectrum[:, nearby].max(axis=-1) / floor)
+        return indicators
@@ -0,0 +1,107 @@
+import asyncio
+from typing import Dict, Any, List, Tuple, Optional, Callable, Awaitable
+from datetime import datetime
+from ..config import settings
+from ..utils.metrics import Histogram
+
+PendingRequest = Tuple[Dict[str, float], asyncio.Future]
+
+class InferenceBatcher:
+    def __init__(self, ml_service, max_batch_size: Optional[int] = None, max_wait_ms: Optional[float] = None):
+        self.ml_service = ml_service
+        self.max_batch_size = max_batch_size or settings.INFERENCE_MAX_BATCH_SIZE
+        self.max_wait_ms = settings.INFERENCE_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+
+        self.batch_methods: Dict[str, Callable[[List[Dict[str, float]]], Awaitable[List[Dict[str, Any]]]]] = {
+            'anomaly_detector': ml_service.predict_anomaly_batch,
+            'failure_predictor': ml_service.predict_failure_batch,
+            'rul_estimator': ml_service.estimate_rul_batch
+        }
+        self.pending: Dict[str, List[PendingRequest]] = {name: [] for name in self.batch_methods}
+        self.timers: Dict[str, asyncio.TimerHandle] = {}
+        self.running_batches = set()
+
+        self.queue_depth_histogram = Histogram()
+        self.batch_size_histogram = Histogram()
+        self.request_count = 0
+        self.batch_count = 0
+        self.failed_batches = 0
+
+    async def predict_anomaly(self, sensor_data: Dict[str, float]) -> Dict[str, Any]:
+        return await self.submit('anomaly_detector', sensor_data)
+
+    async def predict_failure(self, historical_features: Dict[str, float]) -> Dict[str, Any]:
+        return await self.submit('failure_predictor', historical_features)
+
+    async def estimate_rul(self, machine_data: Dict[str, float]) -> Dict[str, Any]:
+        return await self.submit('rul_estimator', machine_data)
+
+    async def submit(self, model_name: str, row: Dict[str, float]) -> Dict[str, Any]:
+        if model_name not in self.batch_methods:
+            raise ValueError(f"Unknown model {model_name}")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        queue = self.pending[model_name]
+        queue.append((row, future))
+        self.request_count += 1
+        self.queue_depth_histogram.observe(len(queue))
+
+        if len(queue) >= self.max_batch_size:
+            self._flush(model_name)
+        elif model_name not in self.timers:
+            self.timers[model_name] = loop.call_later(self.max_wait_ms / 1000, self._flush, model_name)
+
+        return await future
+
+    def _flush(self, model_name: str):
+        timer = self.timers.pop(model_name, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self.pending[model_name]
+        if not batch:
+            return
+        self.pending[model_name] = []
+
+        task = asyncio.get_running_loop().create_task(self._run_batch(model_name, batch))
+        self.running_batches.add(task)
+        task.add_done_callback(self.running_batches.discard)
+
+    async def _run_batch(self, model_name: str, batch: List[PendingRequest]):
+        self.batch_count += 1
+        self.batch_size_histogram.observe(len(batch))
+
+        try:
+            results = await self.batch_methods[model_name]([row for row, _ in batch])
+        except Exception as e:
+            self.failed_batches += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def drain(self):
+        for model_name in list(self.pending):
+            self._flush(model_name)
+
+        if self.running_batches:
+            await asyncio.gather(*self.running_batches, return_exceptions=True)
+
+    def get_batcher_stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "total_requests": self.request_count,
+            "total_batches": self.batch_count,
+            "failed_batches": self.failed_batches,
+            "pending_requests": sum(len(queue) for queue in self.pending.values()),
+            "queue_depth": self.queue_depth_histogram.snapshot(),
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
@@ -1,26 +1,67 @@
 import asyncio
 import json
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, Optional
 from datetime import datetime
 import paho.mqtt.client as mqtt
+from ..config import settings
+from .mqtt_bridge import MessageBridge
+from .mqtt_asyncio import AsyncioMQTTTransport
+from .sensor_ingest import SensorBatchIngestor, BatchCallback
+from .sensor_codec import (
+    PAYLOAD_FORMATS, sensor_topic, encode_sensor_payload, decode_sensor_payload, payload_format_for_topic
+)
+
+BROKER_TRANSPORTS = ("thread", "asyncio")
 
 class IoTBrokerService:
-    def __init__(self, host: str, port: int):
+    def __init__(self, host: str, port: int, queue_maxsize: Optional[int] = None,
+                 overflow_policy: Optional[str] = None, transport: Optional[str] = None,
+                 payload_format: Optional[str] = None):
         self.host = host
         self.port = port
+        self.transport = transport or settings.IOT_BROKER_TRANSPORT
+        if self.transport not in BROKER_TRANSPORTS:
+            raise ValueError(f"Unknown broker transport {self.transport}, expected 'thread' or 'asyncio'")
+        self.payload_format = payload_format or settings.IOT_PAYLOAD_FORMAT
+        if self.payload_format not in PAYLOAD_FORMATS:
+            raise ValueError(f"Unknown payload format {self.payload_format}, expected 'json' or 'binary'")
+        
         self.client = mqtt.Client()
+        self.asyncio_transport: Optional[AsyncioMQTTTransport] = None
         self.subscribers = {}
         self.message_count = 0
+        self.format_counts = {payload_format: 0 for payload_format in PAYLOAD_FORMATS}
         self.connected = False
+        self.queue_maxsize = queue_maxsize
+        self.overflow_policy = overflow_policy
+        self.subscriber_errors = 0
+        self.bridge: Optional[MessageBridge] = None
+        self.ingestor = SensorBatchIngestor()
         
     async def connect(self):
+        loop = asyncio.get_running_loop()
+        if self.transport == "asyncio" and self.asyncio_transport is None:
+            self.asyncio_transport = AsyncioMQTTTransport(self.client, loop)
+        
+        if self.bridge is None:
+            self.bridge = MessageBridge(
+                loop, self._dispatch_message,
+                maxsize=self.queue_maxsize, policy=self.overflow_policy,
+                flow_control=self.asyncio_transport.set_reading if self.asyncio_transport is not None else None
+            )
+        self.bridge.start()
+        self.ingestor.start()
+        
         self.client.on_connect = self._on_connect
         self.client.on_message = self._on_message
         self.client.on_disconnect = self._on_disconnect
         
         try:
-            self.client.connect(self.host, self.port, 60)
-            self.client.loop_start()
+            if self.asyncio_transport is not None:
+                await self.asyncio_transport.connect(self.host, self.port, 60)
+            else:
+                self.client.connect(self.host, self.port, 60)
+                self.client.loop_start()
             self.connected = True
         except Exception as e:
             print(f"Failed to connect to IoT broker: {e}")
@@ -30,28 +71,38 @@ class IoTBrokerService:
         if rc == 0:
             print("Connected to IoT broker")
             self.client.subscribe("factory/machines/+/sensors")
+            self.client.subscribe("factory/machines/+/sensors/bin")
             self.client.subscribe("factory/alerts/#")
         else:
             print(f"Connection failed with code {rc}")
     
     def _on_message(self, client, userdata, msg):
         try:
-            payload = json.loads(msg.payload.decode())
-            topic_parts = msg.topic.split('/')
+            payload_format, topic_parts = payload_format_for_topic(msg.topic.split('/'))
+            payload = decode_sensor_payload(msg.payload, payload_format)
             
-            if len(topic_parts) >= 4 and topic_parts[2] != '+':
-                machine_id = topic_parts[2]
-                
-                for callback in self.subscribers.get(machine_id, []):
-                    asyncio.create_task(callback(machine_id, payload))
-                
-                for callback in self.subscribers.get('all', []):
-                    asyncio.create_task(callback(machine_id, payload))
+            if len(topic_parts) >= 4 and topic_parts[2] != '+' and self.bridge is not None:
+                if self.asyncio_transport is not None:
+                    self.bridge.submit_nowait(topic_parts[2], payload)
+                else:
+                    self.bridge.submit(topic_parts[2], payload)
             
             self.message_count += 1
+            self.format_counts[payload_format] += 1
         except Exception as e:
             print(f"Error processing message: {e}")
     
+    async def _dispatch_message(self, machine_id: str, payload: Dict[str, Any]):
+        for callback in [*self.subscribers.get(machine_id, []), *self.subscribers.get('all', [])]:
+            try:
+                await callback(machine_id, payload)
+            except Exception as e:
+                self.subscriber_errors += 1
+                print(f"Error in subscriber for {machine_id}: {e}")
+        
+        if self.ingestor.subscribers:
+            await self.ingestor.add(machine_id, payload)
+    
     def _on_disconnect(self, client, userdata, rc):
         self.connected = False
         if rc != 0:
@@ -67,14 +118,21 @@ class IoTBrokerService:
             self.subscribers['all'] = []
         self.subscribers['all'].append(callback)
     
-    async def publish_sensor_data(self, machine_id: str, sensor_data: Dict[str, Any]):
-        topic = f"factory/machines/{machine_id}/sensors"
-        payload = json.dumps({
-            **sensor_data,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+    async def subscribe_to_batches(self, callback: BatchCallback):
+        self.ingestor.subscribe(callback)
+    
+    async def subscribe_topic(self, topic: str, qos: int = 0):
+        if self.asyncio_transport is not None:
+            await self.asyncio_transport.subscribe(topic, qos)
+        else:
+            self.client.subscribe(topic, qos)
+    
+    async def publish_sensor_data(self, machine_id: str, sensor_data: Dict[str, Any],
+                                  payload_format: Optional[str] = None):
+        payload_format = payload_format or self.payload_format
+        payload = encode_sensor_payload(sensor_data, payload_format)
         
-        self.client.publish(topic, payload, qos=1)
+        await self._publish(sensor_topic(machine_id, payload_format), payload, qos=1)
     
     async def publish_alert(self, alert_type: str, alert_data: Dict[str, Any]):
         topic = f"factory/alerts/{alert_type}"
@@ -83,19 +141,39 @@ class IoTBrokerService:
             "timestamp": datetime.utcnow().isoformat()
         })
         
-        self.client.publish(topic, payload, qos=2)
+        await self._publish(topic, payload, qos=2)
+    
+    async def _publish(self, topic: str, payload, qos: int):
+        if self.asyncio_transport is not None:
+            await self.asyncio_transport.publish(topic, payload, qos=qos)
+        else:
+            self.client.publish(topic, payload, qos=qos)
     
     async def get_broker_stats(self) -> Dict[str, Any]:
         return {
             "connected": self.connected,
+            "transport": self.transport,
             "host": self.host,
             "port": self.port,
             "total_messages": self.message_count,
+            "messages_by_format": dict(self.format_counts),
+            "payload_format": self.payload_format,
             "active_subscriptions": sum(len(subs) for subs in self.subscribers.values()),
+            "subscriber_errors": self.subscriber_errors,
+            "ingest_queue": self.bridge.get_stats() if self.bridge is not None else None,
+            "ingest_batches": self.ingestor.get_ingest_stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
     
     async def disconnect(self):
-        self.client.loop_stop()
-        self.client.disconnect()
-        self.connected = False
\ No newline at end of file
+        if self.asyncio_transport is not None:
+            await self.asyncio_transport.disconnect()
+        else:
+            self.client.loop_stop()
+            self.client.disconnect()
+        self.connected = False
+        
+        if self.bridge is not None:
+            await self.bridge.stop()
+            self.bridge = None
+        await self.ingestor.stop()
\ No newline at end of file
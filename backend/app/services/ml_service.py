@@ -3,20 +3,121 @@ import pandas as pd
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-import joblib
 import os
-from typing import Dict, Any, List, Tuple
+import copy
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Any, List, Tuple, Union, Optional
 from datetime import datetime
+from ..config import settings
+from ..data.processors import FittedNormalizer
+from .model_registry import ModelRegistry, LoadedModel
+from .tree_compiler import CompiledTreeEnsemble, fold_scaler
+from .prediction_cache import PredictionCache
+
+ANOMALY_FEATURES = ['temperature', 'vibration', 'pressure', 'power_consumption']
+FAILURE_FEATURES = ['temperature_mean', 'temperature_std', 'temperature_max',
+                    'vibration_mean', 'vibration_std', 'vibration_max',
+                    'high_temp_count', 'high_vibe_count']
+RUL_FEATURES = ['cycle', 'temperature', 'vibration', 'pressure', 'power_consumption']
+
+HEALTH_FEATURES = RUL_FEATURES + FAILURE_FEATURES
+FAILURE_WINDOW = 10
+HIGH_TEMPERATURE = 80
+HIGH_VIBRATION = 0.7
+
+MODEL_FEATURES = {
+    'anomaly_detector': ANOMALY_FEATURES,
+    'failure_predictor': FAILURE_FEATURES,
+    'rul_estimator': RUL_FEATURES
+}
+
+FeatureRows = Union[List[Dict[str, float]], np.ndarray]
+
+def create_executor(kind: str, max_workers: int) -> Executor:
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ml-service")
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    raise ValueError(f"Unknown executor type {kind}, expected 'thread' or 'process'")
+
+INFERENCE_BACKENDS = ("sklearn", "compiled")
+
+def _fit_and_evaluate(model, X_train: np.ndarray, X_test: np.ndarray,
+                      y_train: np.ndarray, y_test: np.ndarray) -> Tuple[Any, float, float, np.ndarray]:
+    model.fit(X_train, y_train)
+    return model, model.score(X_train, y_train), model.score(X_test, y_test), model.predict(X_test)
+
+def _grow_ensemble(model, X: np.ndarray, y: np.ndarray, n_new_estimators: int,
+                   max_estimators: int) -> Tuple[Any, float]:
+    model = copy.deepcopy(model)
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_estimators)
+    model.fit(X, y)
+    
+    if isinstance(model, RandomForestClassifier) and len(model.estimators_) > max_estimators:
+        model.estimators_ = model.estimators_[-max_estimators:]
+        model.set_params(n_estimators=max_estimators)
+    
+    model.set_params(warm_start=False)
+    return model, model.score(X, y)
+
+def _score_classifier(model, scaler, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if scaler is not None:
+        features = scaler.transform(features)
+    probabilities = model.predict_proba(features)
+    return model.classes_.take(np.argmax(probabilities, axis=1)), probabilities
+
+def _score_regressor(model, scaler, features: np.ndarray) -> np.ndarray:
+    if scaler is not None:
+        features = scaler.transform(features)
+    return model.predict(features)
 
 class MLService:
-    def __init__(self):
+    def __init__(self, inference_executor: Optional[Executor] = None, training_executor: Optional[Executor] = None,
+                 inference_backend: Optional[str] = None):
         self.models = {}
+        self.inference_models = {}
         self.scalers = {}
+        self.inference_scalers = {}
+        self.model_versions = {}
+        self.model_features = {}
+        self.normalizers: Dict[str, Optional[FittedNormalizer]] = {}
         self.model_dir = "ml_models/saved"
         os.makedirs(self.model_dir, exist_ok=True)
+        self.registry = ModelRegistry(self.model_dir, mmap_mode=settings.ML_MODEL_MMAP_MODE or None)
+        
+        self.anomaly_cache = PredictionCache(
+            ANOMALY_FEATURES,
+            settings.ANOMALY_CACHE_STEPS,
+            max_entries=settings.ANOMALY_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.ANOMALY_CACHE_TTL_SECONDS
+        ) if settings.ANOMALY_CACHE_ENABLED else None
+        
+        self.inference_backend = inference_backend or settings.ML_INFERENCE_BACKEND
+        if self.inference_backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend {self.inference_backend}, expected one of {INFERENCE_BACKENDS}")
+        
+        self.inference_executor = inference_executor or create_executor(
+            settings.ML_INFERENCE_EXECUTOR, settings.ML_INFERENCE_WORKERS
+        )
+        self.training_executor = training_executor or create_executor(
+            settings.ML_TRAINING_EXECUTOR, settings.ML_TRAINING_WORKERS
+        )
         
+    async def _run_inference(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.inference_executor, func, *args)
+    
+    async def _run_training(self, model, X_train: np.ndarray, X_test: np.ndarray,
+                            y_train: np.ndarray, y_test: np.ndarray) -> Tuple[Any, float, float, np.ndarray]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.training_executor, _fit_and_evaluate, model, X_train, X_test, y_train, y_test
+        )
+    
     async def train_anomaly_detector(self, training_data: pd.DataFrame) -> Dict[str, Any]:
-        features = ['temperature', 'vibration', 'pressure', 'power_consumption']
+        features = ANOMALY_FEATURES
         X = training_data[features].values
         y = training_data['is_anomaly'].values
         
@@ -33,20 +134,11 @@ class MLService:
             random_state=42
         )
         
-        model.fit(X_train, y_train)
-        
-        train_score = model.score(X_train, y_train)
-        test_score = model.score(X_test, y_test)
-        
-        self.models['anomaly_detector'] = model
-        self.scalers['anomaly_detector'] = scaler
-        
-        model_path = os.path.join(self.model_dir, 'anomaly_detector.pkl')
-        scaler_path = os.path.join(self.model_dir, 'anomaly_detector_scaler.pkl')
-        joblib.dump(model, model_path)
-        joblib.dump(scaler, scaler_path)
+        model, train_score, test_score, y_pred = await self._run_training(
+            model, X_train, X_test, y_train, y_test
+        )
         
-        return {
+        results = {
             "model_name": "anomaly_detector",
             "train_accuracy": train_score,
             "test_accuracy": test_score,
@@ -55,11 +147,13 @@ class MLService:
             "feature_importance": dict(zip(features, model.feature_importances_)),
             "timestamp": datetime.utcnow().isoformat()
         }
+        
+        normalizer = FittedNormalizer().fit(training_data, features)
+        await self._register_trained_model('anomaly_detector', model, scaler, results, normalizer)
+        return results
     
     async def train_failure_predictor(self, training_data: pd.DataFrame) -> Dict[str, Any]:
-        features = ['temperature_mean', 'temperature_std', 'temperature_max',
-                   'vibration_mean', 'vibration_std', 'vibration_max',
-                   'high_temp_count', 'high_vibe_count']
+        features = FAILURE_FEATURES
         X = training_data[features].values
         y = training_data['failure_probability'].values
         
@@ -76,20 +170,11 @@ class MLService:
             random_state=42
         )
         
-        model.fit(X_train, y_train)
-        
-        train_score = model.score(X_train, y_train)
-        test_score = model.score(X_test, y_test)
-        
-        self.models['failure_predictor'] = model
-        self.scalers['failure_predictor'] = scaler
-        
-        model_path = os.path.join(self.model_dir, 'failure_predictor.pkl')
-        scaler_path = os.path.join(self.model_dir, 'failure_predictor_scaler.pkl')
-        joblib.dump(model, model_path)
-        joblib.dump(scaler, scaler_path)
+        model, train_score, test_score, y_pred = await self._run_training(
+            model, X_train, X_test, y_train, y_test
+        )
         
-        return {
+        results = {
             "model_name": "failure_predictor",
             "train_r2_score": train_score,
             "test_r2_score": test_score,
@@ -98,9 +183,14 @@ class MLService:
             "feature_importance": dict(zip(features, model.feature_importances_)),
             "timestamp": datetime.utcnow().isoformat()
         }
+        
+        normalizer = FittedNormalizer().fit(training_data, features)
+        await self._register_trained_model('failure_predictor', model, scaler, results, normalizer)
+        return results
     
-    async def train_rul_estimator(self, training_data: pd.DataFrame) -> Dict[str, Any]:
-        features = ['cycle', 'temperature', 'vibration', 'pressure', 'power_consumption']
+    async def train_rul_estimator(self, training_data: pd.DataFrame,
+                                  features: Optional[List[str]] = None) -> Dict[str, Any]:
+        features = list(features or RUL_FEATURES)
         X = training_data[features].values
         y = training_data['remaining_useful_life'].values
         
@@ -117,24 +207,14 @@ class MLService:
             random_state=42
         )
         
-        model.fit(X_train, y_train)
-        
-        train_score = model.score(X_train, y_train)
-        test_score = model.score(X_test, y_test)
+        model, train_score, test_score, y_pred = await self._run_training(
+            model, X_train, X_test, y_train, y_test
+        )
         
-        y_pred = model.predict(X_test)
         mae = np.mean(np.abs(y_test - y_pred))
         rmse = np.sqrt(np.mean((y_test - y_pred) ** 2))
         
-        self.models['rul_estimator'] = model
-        self.scalers['rul_estimator'] = scaler
-        
-        model_path = os.path.join(self.model_dir, 'rul_estimator.pkl')
-        scaler_path = os.path.join(self.model_dir, 'rul_estimator_scaler.pkl')
-        joblib.dump(model, model_path)
-        joblib.dump(scaler, scaler_path)
-        
-        return {
+        results = {
             "model_name": "rul_estimator",
             "train_r2_score": train_score,
             "test_r2_score": test_score,
@@ -144,93 +224,346 @@ class MLService:
             "test_samples": len(X_test),
             "timestamp": datetime.utcnow().isoformat()
         }
+        
+        normalizer = FittedNormalizer().fit(training_data, features)
+        await self._register_trained_model('rul_estimator', model, scaler, results, normalizer, features)
+        return results
     
-    async def predict_anomaly(self, sensor_data: Dict[str, float]) -> Dict[str, Any]:
-        if 'anomaly_detector' not in self.models:
-            self.load_model('anomaly_detector')
-        
-        features = np.array([[
-            sensor_data.get('temperature', 0),
-            sensor_data.get('vibration', 0),
-            sensor_data.get('pressure', 0),
-            sensor_data.get('power_consumption', 0)
-        ]])
-        
-        scaler = self.scalers['anomaly_detector']
-        features_scaled = scaler.transform(features)
-        
-        model = self.models['anomaly_detector']
-        prediction = model.predict(features_scaled)[0]
-        probabilities = model.predict_proba(features_scaled)[0]
-        
-        return {
-            "is_anomaly": bool(prediction),
-            "anomaly_score": float(probabilities[1]),
-            "confidence": float(max(probabilities)),
+    async def update_model_incrementally(self, model_name: str, rows: FeatureRows, targets: np.ndarray,
+                                         n_new_estimators: int, max_estimators: int) -> Dict[str, Any]:
+        await self._get_model(model_name)
+        model = self.models[model_name]
+        scaler = self.scalers[model_name]
+        base_version = self.model_versions[model_name]
+        
+        features = self._build_feature_matrix(rows, self.model_features[model_name])
+        targets = np.asarray(targets)
+        if hasattr(model, 'classes_') and not np.isin(model.classes_, targets).all():
+            raise ValueError(
+                f"Incremental update of {model_name} needs samples of every class {model.classes_.tolist()}"
+            )
+        # Boosting stages fit the residuals of earlier ones, so unlike forest trees
+        # they cannot be trimmed; once at the cap the model has to be retrained.
+        n_estimators = len(model.estimators_) + n_new_estimators
+        if not isinstance(model, RandomForestClassifier) and n_estimators > max_estimators:
+            raise ValueError(
+                f"Incremental update of {model_name} would grow it to {n_estimators} boosting stages "
+                f"(cap {max_estimators}), retrain it from scratch instead"
+            )
+        
+        loop = asyncio.get_running_loop()
+        updated_model, buffer_score = await loop.run_in_executor(
+            self.training_executor, _grow_ensemble,
+            model, scaler.transform(features), targets, n_new_estimators, max_estimators
+        )
+        
+        results = {
+            "model_name": model_name,
+            "update_type": "incremental",
+            "base_version": base_version,
+            "samples": len(features),
+            "n_estimators": len(updated_model.estimators_),
+            "buffer_score": buffer_score,
             "timestamp": datetime.utcnow().isoformat()
         }
+        
+        await self._register_trained_model(
+            model_name, updated_model, scaler, results, self.normalizers.get(model_name), self.model_features[model_name]
+        )
+        return results
+    
+    async def predict_anomaly(self, sensor_data: Dict[str, float]) -> Dict[str, Any]:
+        results = await self.predict_anomaly_batch([sensor_data])
+        return results[0]
     
     async def predict_failure(self, historical_features: Dict[str, float]) -> Dict[str, Any]:
-        if 'failure_predictor' not in self.models:
-            self.load_model('failure_predictor')
-        
-        features = np.array([[
-            historical_features.get('temperature_mean', 0),
-            historical_features.get('temperature_std', 0),
-            historical_features.get('temperature_max', 0),
-            historical_features.get('vibration_mean', 0),
-            historical_features.get('vibration_std', 0),
-            historical_features.get('vibration_max', 0),
-            historical_features.get('high_temp_count', 0),
-            historical_features.get('high_vibe_count', 0)
-        ]])
-        
-        scaler = self.scalers['failure_predictor']
-        features_scaled = scaler.transform(features)
-        
-        model = self.models['failure_predictor']
-        failure_prob = model.predict(features_scaled)[0]
-        
-        return {
-            "failure_probability": float(failure_prob),
-            "risk_level": self._classify_risk_level(failure_prob),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        results = await self.predict_failure_batch([historical_features])
+        return results[0]
     
     async def estimate_rul(self, machine_data: Dict[str, float]) -> Dict[str, Any]:
-        if 'rul_estimator' not in self.models:
-            self.load_model('rul_estimator')
-        
-        features = np.array([[
-            machine_data.get('cycle', 0),
-            machine_data.get('temperature', 0),
-            machine_data.get('vibration', 0),
-            machine_data.get('pressure', 0),
-            machine_data.get('power_consumption', 0)
-        ]])
-        
-        scaler = self.scalers['rul_estimator']
-        features_scaled = scaler.transform(features)
-        
-        model = self.models['rul_estimator']
-        rul_hours = model.predict(features_scaled)[0]
-        
-        return {
-            "remaining_useful_life_hours": float(rul_hours),
-            "estimated_days": float(rul_hours / 24),
-            "maintenance_recommended": rul_hours < 168,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        results = await self.estimate_rul_batch([machine_data])
+        return results[0]
+    
+    async def predict_anomaly_batch(self, sensor_data: FeatureRows) -> List[Dict[str, Any]]:
+        model, scaler = await self._get_model('anomaly_detector')
+        model_version = self.model_versions.get('anomaly_detector')
+        
+        features = self._build_feature_matrix(sensor_data, ANOMALY_FEATURES)
+        if len(features) == 0:
+            return []
+        
+        cache = self.anomaly_cache
+        if cache is not None:
+            cache_keys = cache.make_keys(features, model_version)
+            scores = [cache.get(key) for key in cache_keys]
+        else:
+            scores = [None] * len(features)
+        
+        misses = [i for i, score in enumerate(scores) if score is None]
+        if misses:
+            predictions, probabilities = await self._run_inference(
+                _score_classifier, model, scaler, features[misses]
+            )
+            for i, prediction, score, confidence in zip(
+                misses,
+                predictions.tolist(),
+                probabilities[:, 1].tolist(),
+                probabilities.max(axis=1).tolist()
+            ):
+                scores[i] = (bool(prediction), score, confidence)
+                if cache is not None:
+                    cache.put(cache_keys[i], scores[i])
+        
+        timestamp = datetime.utcnow().isoformat()
+        return [
+            {
+                "is_anomaly": is_anomaly,
+                "anomaly_score": score,
+                "confidence": confidence,
+                "timestamp": timestamp
+            }
+            for is_anomaly, score, confidence in scores
+        ]
+    
+    async def predict_failure_batch(self, historical_features: FeatureRows) -> List[Dict[str, Any]]:
+        model, scaler = await self._get_model('failure_predictor')
+        
+        features = self._build_feature_matrix(historical_features, FAILURE_FEATURES)
+        if len(features) == 0:
+            return []
+        
+        failure_probs = await self._run_inference(
+            _score_regressor, model, scaler, features
+        )
+        
+        timestamp = datetime.utcnow().isoformat()
+        return [
+            {
+                "failure_probability": failure_prob,
+                "risk_level": self._classify_risk_level(failure_prob),
+                "timestamp": timestamp
+            }
+            for failure_prob in failure_probs.tolist()
+        ]
     
-    def load_model(self, model_name: str):
-        model_path = os.path.join(self.model_dir, f'{model_name}.pkl')
-        scaler_path = os.path.join(self.model_dir, f'{model_name}_scaler.pkl')
+    async def estimate_rul_batch(self, machine_data: FeatureRows) -> List[Dict[str, Any]]:
+        model, scaler = await self._get_model('rul_estimator')
+        
+        features = self._build_feature_matrix(machine_data, self.model_features['rul_estimator'])
+        if len(features) == 0:
+            return []
+        
+        rul_hours = await self._run_inference(
+            _score_regressor, model, scaler, features
+        )
         
-        if os.path.exists(model_path) and os.path.exists(scaler_path):
-            self.models[model_name] = joblib.load(model_path)
-            self.scalers[model_name] = joblib.load(scaler_path)
+        timestamp = datetime.utcnow().isoformat()
+        return [
+            {
+                "remaining_useful_life_hours": hours,
+                "estimated_days": hours / 24,
+                "maintenance_recommended": hours < 168,
+                "timestamp": timestamp
+            }
+            for hours in rul_hours.tolist()
+        ]
+    
+    async def assess_machines(self, readings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not readings:
+            return []
+        
+        features = self._build_health_matrix(readings)
+        columns = {name: i for i, name in enumerate(HEALTH_FEATURES)}
+        
+        # The active RUL model may have been trained on other features (e.g. C-MAPSS windows).
+        await self._get_model('rul_estimator')
+        rul_features = self.model_features['rul_estimator']
+        if all(feature in columns for feature in rul_features):
+            rul_matrix = features[:, [columns[f] for f in rul_features]]
         else:
-            raise FileNotFoundError(f"Model {model_name} not found")
+            rul_matrix = self._build_feature_matrix(readings, rul_features)
+        
+        anomaly_results, failure_results, rul_results = await asyncio.gather(
+            self.predict_anomaly_batch(features[:, [columns[f] for f in ANOMALY_FEATURES]]),
+            self.predict_failure_batch(features[:, [columns[f] for f in FAILURE_FEATURES]]),
+            self.estimate_rul_batch(rul_matrix)
+        )
+        
+        timestamp = datetime.utcnow().isoformat()
+        assessments = []
+        for reading, anomaly, failure, rul in zip(readings, anomaly_results, failure_results, rul_results):
+            risk_level = self._classify_risk_level(max(failure["failure_probability"], anomaly["anomaly_score"]))
+            
+            assessments.append({
+                "machine_id": reading.get("machine_id"),
+                "is_anomaly": anomaly["is_anomaly"],
+                "anomaly_score": anomaly["anomaly_score"],
+                "failure_probability": failure["failure_probability"],
+                "remaining_useful_life_hours": rul["remaining_useful_life_hours"],
+                "estimated_days": rul["estimated_days"],
+                "risk_level": risk_level,
+                "maintenance_recommended": rul["maintenance_recommended"] or risk_level in ("high", "critical"),
+                "timestamp": timestamp
+            })
+        
+        return assessments
+    
+    def _build_health_matrix(self, readings: List[Dict[str, Any]]) -> np.ndarray:
+        matrix = self._build_feature_matrix(readings, HEALTH_FEATURES)
+        
+        needs_window = [
+            i for i, reading in enumerate(readings)
+            if not all(feature in reading for feature in FAILURE_FEATURES)
+        ]
+        if not needs_window:
+            return matrix
+        
+        # Same trailing window the failure predictor was trained on: the last
+        # FAILURE_WINDOW readings including the current one.
+        temperatures = np.full((len(needs_window), FAILURE_WINDOW), np.nan)
+        vibrations = np.full((len(needs_window), FAILURE_WINDOW), np.nan)
+        for row, i in enumerate(needs_window):
+            window = (list(readings[i].get("history", [])) + [readings[i]])[-FAILURE_WINDOW:]
+            temperatures[row, -len(window):] = [r.get("temperature", 0) for r in window]
+            vibrations[row, -len(window):] = [r.get("vibration", 0) for r in window]
+        
+        counts = np.sum(~np.isnan(temperatures), axis=1)
+        temperature_mean = np.nanmean(temperatures, axis=1)
+        vibration_mean = np.nanmean(vibrations, axis=1)
+        
+        window_features = np.column_stack([
+            temperature_mean,
+            self._window_std(temperatures, temperature_mean, counts),
+            np.nanmax(temperatures, axis=1),
+            vibration_mean,
+            self._window_std(vibrations, vibration_mean, counts),
+            np.nanmax(vibrations, axis=1),
+            np.sum(temperatures > HIGH_TEMPERATURE, axis=1),
+            np.sum(vibrations > HIGH_VIBRATION, axis=1)
+        ])
+        
+        failure_columns = [HEALTH_FEATURES.index(feature) for feature in FAILURE_FEATURES]
+        matrix[np.ix_(needs_window, failure_columns)] = window_features
+        return matrix
+    
+    def _window_std(self, windows: np.ndarray, means: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        squared = np.nansum((windows - means[:, np.newaxis]) ** 2, axis=1)
+        return np.sqrt(squared / np.maximum(counts - 1, 1)) * (counts > 1)
+    
+    def _build_feature_matrix(self, rows: FeatureRows, features: List[str]) -> np.ndarray:
+        if isinstance(rows, np.ndarray):
+            matrix = np.asarray(rows, dtype=np.float64)
+            if matrix.ndim == 1:
+                matrix = matrix.reshape(1, -1)
+            if matrix.ndim != 2 or matrix.shape[1] != len(features):
+                raise ValueError(
+                    f"Expected a 2-D array with {len(features)} columns ({', '.join(features)}), "
+                    f"got shape {matrix.shape}"
+                )
+            return matrix
+        
+        return np.array(
+            [[row.get(feature, 0) for feature in features] for row in rows],
+            dtype=np.float64
+        ).reshape(len(rows), len(features))
+    
+    def save_model(self, model_name: str, model, scaler, metrics: Optional[Dict[str, Any]] = None,
+                   normalizer: Optional[FittedNormalizer] = None,
+                   features: Optional[List[str]] = None) -> Dict[str, Any]:
+        return self.registry.register(
+            model_name, model, scaler, features or MODEL_FEATURES[model_name], metrics,
+            normalizer=normalizer.to_dict() if normalizer is not None else None
+        )
+    
+    def load_model(self, model_name: str, version: Optional[str] = None) -> LoadedModel:
+        loaded, inference_model, inference_scaler = self._load_for_inference(model_name, version)
+        self._install_model(loaded, inference_model, inference_scaler)
+        return loaded
+    
+    async def activate_model(self, model_name: str, version: Optional[str] = None) -> str:
+        loaded, inference_model, inference_scaler = await asyncio.to_thread(
+            self._load_for_inference, model_name, version
+        )
+        if version is not None:
+            await asyncio.to_thread(self.registry.activate, model_name, version)
+        
+        self._install_model(loaded, inference_model, inference_scaler)
+        return loaded.version
+    
+    async def refresh_models(self) -> Dict[str, str]:
+        swapped = {}
+        for model_name, loaded_version in list(self.model_versions.items()):
+            active_version = await asyncio.to_thread(self.registry.active_version, model_name)
+            if active_version and active_version != loaded_version:
+                swapped[model_name] = await self.activate_model(model_name)
+        return swapped
+    
+    async def preload_models(self) -> Dict[str, str]:
+        model_names = await asyncio.to_thread(self.registry.list_models)
+        return {model_name: await self.activate_model(model_name) for model_name in model_names}
+    
+    async def startup(self):
+        if settings.ML_PRELOAD_MODELS:
+            await self.preload_models()
+    
+    async def _get_model(self, model_name: str) -> Tuple[Any, Any]:
+        if model_name not in self.inference_models:
+            await self.activate_model(model_name)
+        return self.inference_models[model_name], self.inference_scalers[model_name]
+    
+    async def _register_trained_model(self, model_name: str, model, scaler, results: Dict[str, Any],
+                                      normalizer: Optional[FittedNormalizer] = None,
+                                      features: Optional[List[str]] = None):
+        manifest = await asyncio.to_thread(
+            self.save_model, model_name, model, scaler, results, normalizer, features
+        )
+        inference_model, inference_scaler = await asyncio.to_thread(self._prepare_for_inference, model, scaler)
+        results["version"] = manifest["version"]
+        
+        self._install_model(LoadedModel(
+            name=model_name,
+            version=manifest["version"],
+            model=model,
+            scaler=scaler,
+            features=manifest["features"],
+            manifest=manifest,
+            normalizer=normalizer.to_dict() if normalizer is not None else None
+        ), inference_model, inference_scaler)
+    
+    def _load_for_inference(self, model_name: str, version: Optional[str] = None) -> Tuple[LoadedModel, Any, Any]:
+        loaded = self.registry.load(model_name, version, MODEL_FEATURES.get(model_name))
+        return (loaded, *self._prepare_for_inference(loaded.model, loaded.scaler))
+    
+    def _prepare_for_inference(self, model, scaler) -> Tuple[Any, Any]:
+        if settings.ML_FOLD_SCALER:
+            try:
+                model, scaler = fold_scaler(model, scaler), None
+            except TypeError as e:
+                print(f"Keeping scaler in the inference path: {e}")
+        
+        if self.inference_backend == "compiled":
+            model = CompiledTreeEnsemble.from_sklearn(model, max_batch_rows=settings.ML_COMPILED_MAX_BATCH_ROWS)
+        return model, scaler
+    
+    def _install_model(self, loaded: LoadedModel, inference_model, inference_scaler):
+        self.models[loaded.name] = loaded.model
+        self.inference_models[loaded.name] = inference_model
+        self.inference_scalers[loaded.name] = inference_scaler
+        
+        if loaded.name == 'anomaly_detector' and self.anomaly_cache is not None:
+            self.anomaly_cache.invalidate()
+        self.scalers[loaded.name] = loaded.scaler
+        self.model_versions[loaded.name] = loaded.version
+        self.model_features[loaded.name] = list(loaded.features or MODEL_FEATURES.get(loaded.name, []))
+        self.normalizers[loaded.name] = FittedNormalizer.from_dict(loaded.normalizer) if loaded.normalizer else None
+    
+    async def get_normalizer(self, model_name: str) -> Optional[FittedNormalizer]:
+        await self._get_model(model_name)
+        return self.normalizers.get(model_name)
+    
+    def shutdown(self, wait: bool = True):
+        self.inference_executor.shutdown(wait=wait)
+        self.training_executor.shutdown(wait=wait)
     
     def _classify_risk_level(self, probability: float) -> str:
         if probability >= 0.8:
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import joblib
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+
+MODEL_FILE = "model.pkl"
+SCALER_FILE = "scaler.pkl"
+NORMALIZER_FILE = "normalizer.json"
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+LEGACY_VERSION = "legacy"
+STAGING_SUFFIX = ".tmp"
+# Younger staging dirs may belong to a registration still running in another process.
+STALE_STAGING_SECONDS = 3600
+
+@dataclass
+class LoadedModel:
+    name: str
+    version: str
+    model: Any
+    scaler: Any
+    features: List[str]
+    manifest: Dict[str, Any] = field(default_factory=dict)
+    normalizer: Optional[Dict[str, Any]] = None
+
+class ModelRegistry:
+    def __init__(self, root_dir: str, mmap_mode: Optional[str] = "r"):
+        self.root_dir = root_dir
+        self.mmap_mode = mmap_mode
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._remove_stale_staging()
+
+    def register(self, model_name: str, model, scaler, features: List[str],
+                 metrics: Optional[Dict[str, Any]] = None, activate: bool = True,
+                 normalizer: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        version = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        version_dir = self._version_dir(model_name, version)
+        staging_dir = f"{version_dir}{STAGING_SUFFIX}"
+        os.makedirs(staging_dir)
+
+        # Uncompressed dumps so numpy buffers can be memory-mapped on load.
+        joblib.dump(model, os.path.join(staging_dir, MODEL_FILE))
+        joblib.dump(scaler, os.path.join(staging_dir, SCALER_FILE))
+        artifacts = [MODEL_FILE, SCALER_FILE]
+        if normalizer is not None:
+            with open(os.path.join(staging_dir, NORMALIZER_FILE), "w") as fh:
+                json.dump(self._to_builtin(normalizer), fh, indent=2)
+            artifacts.append(NORMALIZER_FILE)
+
+        manifest = {
+            "model_name": model_name,
+            "version": version,
+            "model_class": type(model).__name__,
+            "features": list(features),
+            "scaler": self._describe_scaler(scaler),
+            "metrics": self._to_builtin(metrics or {}),
+            "checksums": {
+                file_name: self._checksum(os.path.join(staging_dir, file_name)) for file_name in artifacts
+            },
+            "created_at": datetime.utcnow().isoformat()
+        }
+        with open(os.path.join(staging_dir, MANIFEST_FILE), "w") as fh:
+            json.dump(manifest, fh, indent=2)
+
+        os.replace(staging_dir, version_dir)
+
+        if activate:
+            self.activate(model_name, version)
+
+        return manifest
+
+    def activate(self, model_name: str, version: str):
+        if not os.path.exists(os.path.join(self._version_dir(model_name, version), MANIFEST_FILE)):
+            raise FileNotFoundError(f"Model {model_name} version {version} not found")
+
+        current_path = os.path.join(self.root_dir, model_name, CURRENT_FILE)
+        tmp_path = f"{current_path}{STAGING_SUFFIX}"
+        with open(tmp_path, "w") as fh:
+            fh.write(version)
+        os.replace(tmp_path, current_path)
+
+    def active_version(self, model_name: str) -> Optional[str]:
+        current_path = os.path.join(self.root_dir, model_name, CURRENT_FILE)
+        if os.path.exists(current_path):
+            with open(current_path) as fh:
+                return fh.read().strip()
+
+        versions = self.list_versions(model_name)
+        if versions:
+            return versions[-1]
+        if os.path.exists(self._legacy_path(model_name)):
+            return LEGACY_VERSION
+        return None
+
+    def list_versions(self, model_name: str) -> List[str]:
+        model_dir = os.path.join(self.root_dir, model_name)
+        if not os.path.isdir(model_dir):
+            return []
+
+        return sorted(
+            entry for entry in os.listdir(model_dir)
+            if not entry.endswith(STAGING_SUFFIX) and os.path.exists(os.path.join(model_dir, entry, MANIFEST_FILE))
+        )
+
+    def list_models(self) -> List[str]:
+        names = set()
+        for entry in os.listdir(self.root_dir):
+            if os.path.isdir(os.path.join(self.root_dir, entry)) and self.list_versions(entry):
+                names.add(entry)
+            elif entry.endswith(".pkl") and not entry.endswith("_scaler.pkl"):
+                names.add(entry[:-len(".pkl")])
+        return sorted(names)
+
+    def get_manifest(self, model_name: str, version: Optional[str] = None) -> Dict[str, Any]:
+        version = version or self.active_version(model_name)
+        if version is None or version == LEGACY_VERSION:
+            return {}
+
+        with open(os.path.join(self._version_dir(model_name, version), MANIFEST_FILE)) as fh:
+            return json.load(fh)
+
+    def load(self, model_name: str, version: Optional[str] = None,
+             default_features: Optional[List[str]] = None) -> LoadedModel:
+        version = version or self.active_version(model_name)
+        if version is None:
+            raise FileNotFoundError(f"Model {model_name} not found")
+
+        if version == LEGACY_VERSION:
+            return self._load_legacy(model_name, default_features or [])
+
+        version_dir = self._version_dir(model_name, version)
+        manifest = self.get_manifest(model_name, version)
+
+        for file_name, expected in manifest.get("checksums", {}).items():
+            actual = self._checksum(os.path.join(version_dir, file_name))
+            if actual != expected:
+                raise ValueError(
+                    f"Checksum mismatch for {model_name} version {version} ({file_name})"
+                )
+
+        return LoadedModel(
+            name=model_name,
+            version=version,
+            model=joblib.load(os.path.join(version_dir, MODEL_FILE), mmap_mode=self.mmap_mode),
+            scaler=joblib.load(os.path.join(version_dir, SCALER_FILE), mmap_mode=self.mmap_mode),
+            features=manifest.get("features", default_features or []),
+            manifest=manifest,
+            normalizer=self._load_normalizer(version_dir)
+        )
+
+    def _load_normalizer(self, version_dir: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(version_dir, NORMALIZER_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as fh:
+            return json.load(fh)
+
+    def _load_legacy(self, model_name: str, features: List[str]) -> LoadedModel:
+        model_path = self._legacy_path(model_name)
+        scaler_path = os.path.join(self.root_dir, f"{model_name}_scaler.pkl")
+
+        if not (os.path.exists(model_path) and os.path.exists(scaler_path)):
+            raise FileNotFoundError(f"Model {model_name} not found")
+
+        return LoadedModel(
+            name=model_name,
+            version=LEGACY_VERSION,
+            model=joblib.load(model_path),
+            scaler=joblib.load(scaler_path),
+            features=features
+        )
+
+    def _remove_stale_staging(self):
+        # Staging dirs and CURRENT temp files left behind by a crash mid-register/activate.
+        cutoff = time.time() - STALE_STAGING_SECONDS
+        for model_name in os.listdir(self.root_dir):
+            model_dir = os.path.join(self.root_dir, model_name)
+            if not os.path.isdir(model_dir):
+                continue
+            for entry in os.listdir(model_dir):
+                path = os.path.join(model_dir, entry)
+                if not entry.endswith(STAGING_SUFFIX) or os.path.getmtime(path) > cutoff:
+                    continue
+                try:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path)
+                    else:
+                        os.remove(path)
+                except OSError as e:
+                    print(f"Error removing stale staging entry {path}: {e}")
+
+    def _version_dir(self, model_name: str, version: str) -> str:
+        return os.path.join(self.root_dir, model_name, version)
+
+    def _legacy_path(self, model_name: str) -> str:
+        return os.path.join(self.root_dir, f"{model_name}.pkl")
+
+    def _checksum(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+        return f"sha256:{digest.hexdigest()}"
+
+    def _describe_scaler(self, scaler) -> Dict[str, Any]:
+        description = {"class": type(scaler).__name__}
+        for attribute in ("mean_", "scale_", "var_"):
+            value = getattr(scaler, attribute, None)
+            if value is not None:
+                description[attribute.rstrip("_")] = [float(v) for v in value]
+        return description
+
+    def _to_builtin(self, value):
+        if isinstance(value, dict):
+            return {str(k): self._to_builtin(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._to_builtin(v) for v in value]
+        if hasattr(value, "item"):
+            return value.item()
+        return value
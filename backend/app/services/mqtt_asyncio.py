@@ -0,0 +1,146 @@
+import asyncio
+from typing import Dict, Any, Optional
+import paho.mqtt.client as mqtt
+
+MISC_INTERVAL_SECONDS = 1.0
+RECONNECT_DELAY_SECONDS = 1.0
+
+class AsyncioMQTTTransport:
+    def __init__(self, client: mqtt.Client, loop: asyncio.AbstractEventLoop):
+        self.client = client
+        self.loop = loop
+        self.sock = None
+        self.reading = True
+        self.misc_task: Optional[asyncio.Task] = None
+        self.closed: Optional[asyncio.Future] = None
+        self.pending_publishes: Dict[int, asyncio.Future] = {}
+        self.pending_subscribes: Dict[int, asyncio.Future] = {}
+
+        client.on_socket_open = self._on_socket_open
+        client.on_socket_close = self._on_socket_close
+        client.on_socket_register_write = self._on_socket_register_write
+        client.on_socket_unregister_write = self._on_socket_unregister_write
+        client.on_publish = self._on_publish
+        client.on_subscribe = self._on_subscribe
+
+    async def connect(self, host: str, port: int, keepalive: int = 60):
+        # DNS lookup and the TCP handshake block, so they run off the loop; the
+        # socket callbacks they trigger are marshalled back onto it.
+        await asyncio.to_thread(self.client.connect, host, port, keepalive)
+        if self.misc_task is None:
+            self.misc_task = self.loop.create_task(self._misc_loop())
+
+    async def disconnect(self, timeout: float = 1.0):
+        if self.misc_task is not None:
+            self.misc_task.cancel()
+            self.misc_task = None
+
+        if self.sock is not None:
+            self.closed = self.loop.create_future()
+            self.client.disconnect()
+            try:
+                await asyncio.wait_for(asyncio.shield(self.closed), timeout)
+            except asyncio.TimeoutError:
+                print("Timed out waiting for the MQTT connection to close")
+
+        self._fail_pending(ConnectionError("MQTT client disconnected"))
+
+    async def publish(self, topic: str, payload: Any, qos: int = 0, retain: bool = False) -> int:
+        info = self.client.publish(topic, payload, qos=qos, retain=retain)
+        if info.rc != mqtt.MQTT_ERR_SUCCESS:
+            raise ConnectionError(f"Publish to {topic} failed: {mqtt.error_string(info.rc)}")
+        if info.is_published():
+            return info.mid
+
+        future = self.loop.create_future()
+        self.pending_publishes[info.mid] = future
+        await future
+        return info.mid
+
+    async def subscribe(self, topic: str, qos: int = 0) -> int:
+        rc, mid = self.client.subscribe(topic, qos)
+        if rc != mqtt.MQTT_ERR_SUCCESS:
+            raise ConnectionError(f"Subscribe to {topic} failed: {mqtt.error_string(rc)}")
+
+        future = self.loop.create_future()
+        self.pending_subscribes[mid] = future
+        granted = await future
+        if granted[0] == 0x80:
+            raise PermissionError(f"Broker refused subscription to {topic}")
+        return granted[0]
+
+    def set_reading(self, enabled: bool):
+        if enabled == self.reading:
+            return
+        self.reading = enabled
+        if self.sock is None:
+            return
+        if enabled:
+            self.loop.add_reader(self.sock, self.client.loop_read)
+        else:
+            self.loop.remove_reader(self.sock)
+
+    def _call_on_loop(self, callback, *args):
+        try:
+            on_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            callback(*args)
+        else:
+            self.loop.call_soon_threadsafe(callback, *args)
+
+    def _on_socket_open(self, client, userdata, sock):
+        self._call_on_loop(self._socket_opened, sock)
+
+    def _socket_opened(self, sock):
+        self.sock = sock
+        if self.reading:
+            self.loop.add_reader(sock, self.client.loop_read)
+
+    def _on_socket_close(self, client, userdata, sock):
+        self._call_on_loop(self._socket_closed, sock)
+
+    def _socket_closed(self, sock):
+        self.loop.remove_reader(sock)
+        self.loop.remove_writer(sock)
+        if self.sock is sock:
+            self.sock = None
+        if self.closed is not None and not self.closed.done():
+            self.closed.set_result(None)
+
+    def _on_socket_register_write(self, client, userdata, sock):
+        self._call_on_loop(self.loop.add_writer, sock, client.loop_write)
+
+    def _on_socket_unregister_write(self, client, userdata, sock):
+        self._call_on_loop(self.loop.remove_writer, sock)
+
+    def _on_publish(self, client, userdata, mid):
+        future = self.pending_publishes.pop(mid, None)
+        if future is not None and not future.done():
+            future.set_result(mid)
+
+    def _on_subscribe(self, client, userdata, mid, granted_qos):
+        future = self.pending_subscribes.pop(mid, None)
+        if future is not None and not future.done():
+            future.set_result(granted_qos)
+
+    def _fail_pending(self, error: Exception):
+        for pending in (self.pending_publishes, self.pending_subscribes):
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            pending.clear()
+
+    async def _misc_loop(self):
+        while True:
+            await asyncio.sleep(MISC_INTERVAL_SECONDS)
+            if self.client.loop_misc() != mqtt.MQTT_ERR_NO_CONN:
+                continue
+
+            self._fail_pending(ConnectionError("MQTT connection lost"))
+            try:
+                await asyncio.to_thread(self.client.reconnect)
+            except OSError as e:
+                print(f"Failed to reconnect to IoT broker: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
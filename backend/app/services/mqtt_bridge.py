@@ -0,0 +1,263 @@
+import asyncio
+import threading
+from collections import deque, Counter
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+from ..config import settings
+from ..utils.metrics import Histogram
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest_per_machine", "conflate")
+
+class BridgedMessage:
+    __slots__ = ("machine_id", "payload")
+
+    def __init__(self, machine_id: str, payload: Dict[str, Any]):
+        self.machine_id = machine_id
+        self.payload = payload
+
+class MessageBridge:
+    def __init__(self, loop: asyncio.AbstractEventLoop, handler: Callable[[str, Dict[str, Any]], Awaitable[None]],
+                 maxsize: Optional[int] = None, policy: Optional[str] = None,
+                 block_timeout: Optional[float] = None, flow_control: Optional[Callable[[bool], None]] = None,
+                 concurrency: Optional[int] = None):
+        self.loop = loop
+        self.handler = handler
+        self.flow_control = flow_control
+        self.maxsize = maxsize or settings.IOT_QUEUE_MAXSIZE
+        self.policy = policy or settings.IOT_OVERFLOW_POLICY
+        self.block_timeout = settings.IOT_BLOCK_TIMEOUT_SECONDS if block_timeout is None else block_timeout
+        self.drain_timeout = settings.IOT_DRAIN_TIMEOUT_SECONDS
+        self.concurrency = max(1, concurrency or settings.IOT_DISPATCH_CONCURRENCY)
+        if self.policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {self.policy}, expected one of {', '.join(OVERFLOW_POLICIES)}")
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=self.maxsize)
+        self.pending_by_machine: Dict[str, BridgedMessage] = {}
+
+        # Messages handed over by the network thread but not yet moved into the
+        # queue. A single wakeup is scheduled per batch of handoffs.
+        self.inbox: deque = deque()
+        self.inbox_lock = threading.Lock()
+        self.wakeup_scheduled = False
+        self.free_slots = threading.BoundedSemaphore(self.maxsize)
+
+        # Producers on the loop thread cannot block, so under the block policy
+        # they park the message and pause reading through flow_control.
+        self.parked: deque = deque()
+        self.reading_paused = False
+
+        # The dispatcher shards messages by machine onto worker queues, so handlers
+        # for different machines overlap while each machine's readings stay in order.
+        self.dispatcher: Optional[asyncio.Task] = None
+        self.shards: List[asyncio.Queue] = []
+        self.workers: List[asyncio.Task] = []
+        self.outstanding = 0
+        self.closed = False
+
+        self.received = 0
+        self.dispatched = 0
+        self.dropped_oldest = 0
+        self.dropped_newest = 0
+        self.dropped_newest_by_machine: Counter = Counter()
+        self.conflated = 0
+        self.block_timeouts = 0
+        self.dropped_on_stop = 0
+        self.handler_errors = 0
+        self.max_depth = 0
+        self.batch_size_histogram = Histogram()
+
+    def start(self):
+        if self.dispatcher is None:
+            self.shards = [asyncio.Queue(maxsize=1) for _ in range(self.concurrency)]
+            self.workers = [self.loop.create_task(self._work(shard)) for shard in self.shards]
+            self.dispatcher = self.loop.create_task(self._dispatch())
+
+    async def stop(self, timeout: Optional[float] = None):
+        self.closed = True
+        if self.dispatcher is not None:
+            try:
+                await asyncio.wait_for(self._drain(), self.drain_timeout if timeout is None else timeout)
+            except asyncio.TimeoutError:
+                print("Timed out draining the MQTT ingest queue")
+
+        for _ in range(self.maxsize):
+            try:
+                self.free_slots.release()
+            except ValueError:
+                break
+
+        with self.inbox_lock:
+            self.dropped_on_stop += self.outstanding + self.queue.qsize() + len(self.inbox) + len(self.parked)
+            self.inbox.clear()
+        self.parked.clear()
+
+        if self.dispatcher is not None:
+            tasks = [self.dispatcher, *self.workers]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.dispatcher = None
+            self.workers = []
+            self.shards = []
+            self.outstanding = 0
+
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+
+    async def _drain(self):
+        # Hand over whatever the network thread already accepted, then wait until
+        # the dispatcher has finished every queued and parked message.
+        while True:
+            if self.inbox:
+                self._drain_inbox()
+            await self.queue.join()
+            if not self.inbox and not self.parked:
+                return
+
+    def submit(self, machine_id: str, payload: Dict[str, Any]) -> bool:
+        if self.closed:
+            return False
+
+        if self.policy == "block":
+            if not self.free_slots.acquire(timeout=self.block_timeout):
+                self.block_timeouts += 1
+                return False
+            if self.closed:
+                return False
+
+        message = BridgedMessage(machine_id, payload)
+        with self.inbox_lock:
+            self.received += 1
+            if self.policy != "block" and len(self.inbox) >= self.maxsize:
+                # The event loop is not draining at all; bound the handoff buffer too.
+                if self.policy == "drop_oldest":
+                    self.inbox.popleft()
+                    self.dropped_oldest += 1
+                else:
+                    self._drop_newest(message)
+                    return False
+            self.inbox.append(message)
+            wakeup = not self.wakeup_scheduled
+            self.wakeup_scheduled = True
+
+        if wakeup:
+            try:
+                self.loop.call_soon_threadsafe(self._drain_inbox)
+            except RuntimeError:
+                return False
+        return True
+
+    def submit_nowait(self, machine_id: str, payload: Dict[str, Any]) -> bool:
+        if self.closed:
+            return False
+
+        message = BridgedMessage(machine_id, payload)
+        self.received += 1
+        if self.policy == "block" and (self.parked or not self.free_slots.acquire(blocking=False)):
+            self.parked.append(message)
+            self._set_reading(False)
+            return True
+
+        self._enqueue(message)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return True
+
+    def _unpark(self):
+        while self.parked and self.free_slots.acquire(blocking=False):
+            self._enqueue(self.parked.popleft())
+        if not self.parked:
+            self._set_reading(True)
+
+    def _set_reading(self, enabled: bool):
+        if self.reading_paused != enabled:
+            return
+        self.reading_paused = not enabled
+        if self.flow_control is not None:
+            self.flow_control(enabled)
+
+    def _drain_inbox(self):
+        with self.inbox_lock:
+            messages = self.inbox
+            self.inbox = deque()
+            self.wakeup_scheduled = False
+
+        self.batch_size_histogram.observe(len(messages))
+        for message in messages:
+            self._enqueue(message)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _enqueue(self, message: BridgedMessage):
+        if self.policy == "conflate":
+            pending = self.pending_by_machine.get(message.machine_id)
+            if pending is not None and self.queue.full():
+                pending.payload = message.payload
+                self.conflated += 1
+                return
+        elif self.policy == "drop_oldest" and self.queue.full():
+            dropped = self.queue.get_nowait()
+            self.queue.task_done()
+            self._forget(dropped)
+            self.dropped_oldest += 1
+
+        if self.queue.full():
+            self._drop_newest(message)
+            return
+
+        self.queue.put_nowait(message)
+        if self.policy == "conflate":
+            self.pending_by_machine[message.machine_id] = message
+
+    def _drop_newest(self, message: BridgedMessage):
+        self.dropped_newest += 1
+        if self.policy == "drop_newest_per_machine":
+            self.dropped_newest_by_machine[message.machine_id] += 1
+
+    def _forget(self, message: BridgedMessage):
+        if self.pending_by_machine.get(message.machine_id) is message:
+            del self.pending_by_machine[message.machine_id]
+        if self.policy == "block":
+            self.free_slots.release()
+
+    async def _dispatch(self):
+        while True:
+            message = await self.queue.get()
+            self.outstanding += 1
+            self._forget(message)
+            if self.parked:
+                self._unpark()
+            await self.shards[hash(message.machine_id) % len(self.shards)].put(message)
+
+    async def _work(self, shard: asyncio.Queue):
+        while True:
+            message = await shard.get()
+            try:
+                await self.handler(message.machine_id, message.payload)
+            except Exception as e:
+                self.handler_errors += 1
+                print(f"Error handling message for {message.machine_id}: {e}")
+            finally:
+                self.outstanding -= 1
+                self.queue.task_done()
+            self.dispatched += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "overflow_policy": self.policy,
+            "dispatch_concurrency": self.concurrency,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.maxsize,
+            "max_queue_depth": self.max_depth,
+            "handoff_backlog": len(self.inbox),
+            "parked": len(self.parked),
+            "reading_paused": self.reading_paused,
+            "received": self.received,
+            "dispatched": self.dispatched,
+            "dropped_oldest": self.dropped_oldest,
+            "dropped_newest": self.dropped_newest,
+            "dropped_newest_by_machine": dict(self.dropped_newest_by_machine.most_common(10)),
+            "conflated": self.conflated,
+            "block_timeouts": self.block_timeouts,
+            "dropped_on_stop": self.dropped_on_stop,
+            "handler_errors": self.handler_errors,
+            "handoff_batch_size": self.batch_size_histogram.snapshot()
+        }
@@ -0,0 +1,92 @@
+import asyncio
+from collections import deque
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+from ..config import settings
+
+TARGET_COLUMNS = {
+    'anomaly_detector': 'is_anomaly',
+    'failure_predictor': 'failure_probability',
+    'rul_estimator': 'remaining_useful_life'
+}
+
+class OnlineModelUpdater:
+    def __init__(self, ml_service, model_name: str = 'anomaly_detector', buffer_size: Optional[int] = None,
+                 min_new_samples: Optional[int] = None, update_interval_seconds: Optional[float] = None,
+                 new_estimators: Optional[int] = None, max_estimators: Optional[int] = None):
+        if model_name not in TARGET_COLUMNS:
+            raise ValueError(f"Unknown model {model_name}")
+
+        self.ml_service = ml_service
+        self.model_name = model_name
+        self.target_column = TARGET_COLUMNS[model_name]
+        self.buffer = deque(maxlen=buffer_size or settings.ONLINE_UPDATE_BUFFER_SIZE)
+        self.min_new_samples = min_new_samples or settings.ONLINE_UPDATE_MIN_NEW_SAMPLES
+        self.update_interval_seconds = update_interval_seconds or settings.ONLINE_UPDATE_INTERVAL_SECONDS
+        self.new_estimators = new_estimators or settings.ONLINE_UPDATE_NEW_ESTIMATORS
+        self.max_estimators = max_estimators or settings.ONLINE_UPDATE_MAX_ESTIMATORS
+
+        self.new_samples = 0
+        self.update_count = 0
+        self.skipped_updates = 0
+        self.last_update: Optional[Dict[str, Any]] = None
+        self.stopping = asyncio.Event()
+        self.update_lock = asyncio.Lock()
+
+    def add_labeled_reading(self, reading: Dict[str, Any], label: Optional[float] = None):
+        if label is None:
+            label = reading[self.target_column]
+        self.buffer.append((reading, label))
+        self.new_samples += 1
+
+    def add_labeled_readings(self, readings: List[Dict[str, Any]]):
+        for reading in readings:
+            self.add_labeled_reading(reading)
+
+    async def update(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        async with self.update_lock:
+            if not self.buffer or (not force and self.new_samples < self.min_new_samples):
+                return None
+
+            rows = [reading for reading, _ in self.buffer]
+            labels = [label for _, label in self.buffer]
+            # Readings added while the update is awaited count toward the next one.
+            count = self.new_samples
+
+            try:
+                results = await self.ml_service.update_model_incrementally(
+                    self.model_name, rows, labels, self.new_estimators, self.max_estimators
+                )
+            except ValueError as e:
+                print(f"Skipping online update of {self.model_name}: {e}")
+                self.skipped_updates += 1
+                return None
+
+            self.new_samples -= count
+            self.update_count += 1
+            self.last_update = results
+            return results
+
+    async def run(self):
+        while not self.stopping.is_set():
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=self.update_interval_seconds)
+            except asyncio.TimeoutError:
+                await self.update()
+
+    def stop(self):
+        self.stopping.set()
+
+    def get_updater_stats(self) -> Dict[str, Any]:
+        return {
+            "model_name": self.model_name,
+            "buffered_samples": len(self.buffer),
+            "buffer_size": self.buffer.maxlen,
+            "new_samples": self.new_samples,
+            "min_new_samples": self.min_new_samples,
+            "update_interval_seconds": self.update_interval_seconds,
+            "updates": self.update_count,
+            "skipped_updates": self.skipped_updates,
+            "last_update": self.last_update,
+            "timestamp": datetime.utcnow().isoformat()
+        }
@@ -0,0 +1,84 @@
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Hashable
+from datetime import datetime
+
+class PredictionCache:
+    def __init__(self, features: List[str], steps: Dict[str, float], max_entries: int = 10000,
+                 ttl_seconds: float = 60.0):
+        missing = [feature for feature in features if feature not in steps]
+        unknown = [feature for feature in steps if feature not in features]
+        if missing or unknown:
+            raise ValueError(
+                f"Quantization steps must cover exactly {', '.join(features)} "
+                f"(missing: {', '.join(missing) or 'none'}, unknown: {', '.join(unknown) or 'none'})"
+            )
+
+        self.features = list(features)
+        self.steps = np.array([steps[feature] for feature in self.features], dtype=np.float64)
+        if np.any(self.steps <= 0):
+            raise ValueError("Quantization steps must be positive")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def make_keys(self, features: np.ndarray, model_version: Optional[str]) -> List[Tuple]:
+        buckets = np.floor(np.asarray(features, dtype=np.float64) / self.steps).astype(np.int64)
+        return [(model_version, *row) for row in buckets.tolist()]
+
+    def make_key(self, row: Dict[str, float], model_version: Optional[str]) -> Tuple:
+        features = np.array([[row.get(feature, 0) for feature in self.features]])
+        return self.make_keys(features, model_version)[0]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self):
+        self.entries.clear()
+        self.invalidations += 1
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "quantization_steps": dict(zip(self.features, self.steps.tolist())),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "timestamp": datetime.utcnow().isoformat()
+        }
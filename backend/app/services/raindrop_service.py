@@ -1,4 +1,6 @@
+import asyncio
 import httpx
+import numpy as np
 from typing import Dict, Any, List
 import json
 
@@ -8,22 +10,49 @@ class RaindropService:
         self.sql_endpoint = config.RAINDROP_SQL_ENDPOINT
         self.memory_endpoint = config.RAINDROP_MEMORY_ENDPOINT
         self.inference_endpoint = config.RAINDROP_INFERENCE_ENDPOINT
+        self.store_concurrency = config.RAINDROP_STORE_CONCURRENCY
         
     async def store_sensor_data(self, machine_id: str, sensor_data: Dict[str, Any]) -> bool:
         async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.bucket_endpoint}/smartbuckets/sensor_data",
-                    json={
-                        "machine_id": machine_id,
-                        "data": sensor_data,
-                        "timestamp": sensor_data.get("timestamp")
-                    }
-                )
-                return response.status_code == 200
-            except Exception as e:
-                print(f"Error storing sensor data: {e}")
-                return False
+            return await self._post_sensor_data(client, machine_id, sensor_data)
+    
+    async def store_sensor_batch(self, batch) -> bool:
+        # The bucket only has the per-record endpoint, so post each reading over
+        # one client with a bounded number of requests in flight.
+        timestamps = np.datetime_as_string(batch.timestamps, unit='us')
+        columns = {column: values.astype(object) for column, values in batch.columns.items()}
+        for values in columns.values():
+            values[values != values] = None
+        
+        records = []
+        for i, machine_id in enumerate(batch.machine_ids.tolist()):
+            sensor_data = {column: values[i] for column, values in columns.items()}
+            sensor_data["timestamp"] = None if timestamps[i] == 'NaT' else str(timestamps[i])
+            records.append((machine_id, sensor_data))
+        
+        semaphore = asyncio.Semaphore(self.store_concurrency)
+        async with httpx.AsyncClient() as client:
+            async def store(machine_id: str, sensor_data: Dict[str, Any]) -> bool:
+                async with semaphore:
+                    return await self._post_sensor_data(client, machine_id, sensor_data)
+            
+            stored = await asyncio.gather(*(store(machine_id, sensor_data) for machine_id, sensor_data in records))
+        return all(stored)
+    
+    async def _post_sensor_data(self, client: httpx.AsyncClient, machine_id: str, sensor_data: Dict[str, Any]) -> bool:
+        try:
+            response = await client.post(
+                f"{self.bucket_endpoint}/smartbuckets/sensor_data",
+                json={
+                    "machine_id": machine_id,
+                    "data": sensor_data,
+                    "timestamp": sensor_data.get("timestamp")
+                }
+            )
+            return response.status_code == 200
+        except Exception as e:
+            print(f"Error storing sensor data: {e}")
+            return False
     
     async def query_operational_analytics(self, query: str) -> List[Dict[str, Any]]:
         async with httpx.AsyncClient() as client:
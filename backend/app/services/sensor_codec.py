@@ -0,0 +1,76 @@
+import json
+import math
+import struct
+import time
+from typing import Dict, Any, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+from ..data.processors import SENSOR_COLUMNS
+
+PAYLOAD_FORMATS = ("json", "binary")
+BINARY_TOPIC_SUFFIX = "bin"
+BINARY_VERSION = 1
+
+# version, value count, epoch-ns timestamp, then float32 values in SENSOR_COLUMNS order (NaN = missing)
+BINARY_HEADER = struct.Struct('<BxHq')
+BINARY_SENSOR_STRUCT = struct.Struct(f'<BxHq{len(SENSOR_COLUMNS)}f')
+BINARY_FIELDS = frozenset(SENSOR_COLUMNS) | {"timestamp"}
+EPOCH = datetime(1970, 1, 1)
+
+def sensor_topic(machine_id: str, payload_format: str = "json") -> str:
+    topic = f"factory/machines/{machine_id}/sensors"
+    if payload_format == "binary":
+        return f"{topic}/{BINARY_TOPIC_SUFFIX}"
+    return topic
+
+def encode_sensor_payload(sensor_data: Dict[str, Any], payload_format: str = "json",
+                          timestamp_ns: Optional[int] = None) -> bytes:
+    if payload_format == "json":
+        return json.dumps({
+            **sensor_data,
+            "timestamp": datetime.utcnow().isoformat()
+        }).encode()
+    if payload_format != "binary":
+        raise ValueError(f"Unknown payload format {payload_format}, expected one of {', '.join(PAYLOAD_FORMATS)}")
+    unknown = sensor_data.keys() - BINARY_FIELDS
+    if unknown:
+        raise ValueError(f"Binary sensor payload cannot carry {', '.join(sorted(map(str, unknown)))}; "
+                         f"only {', '.join(SENSOR_COLUMNS)} are encoded")
+
+    return BINARY_SENSOR_STRUCT.pack(
+        BINARY_VERSION, len(SENSOR_COLUMNS),
+        time.time_ns() if timestamp_ns is None else timestamp_ns,
+        *[_as_float(sensor_data.get(column)) for column in SENSOR_COLUMNS]
+    )
+
+def decode_sensor_payload(payload: bytes, payload_format: str = "json") -> Dict[str, Any]:
+    if payload_format == "json":
+        return json.loads(payload)
+
+    if len(payload) < BINARY_HEADER.size:
+        raise ValueError(f"Binary sensor payload is {len(payload)} bytes, shorter than the "
+                         f"{BINARY_HEADER.size}-byte header")
+    version, n_values, timestamp_ns = BINARY_HEADER.unpack_from(payload)
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary sensor payload version {version}")
+    if n_values != len(SENSOR_COLUMNS):
+        raise ValueError(f"Binary sensor payload has {n_values} values, expected {len(SENSOR_COLUMNS)}")
+    if len(payload) != BINARY_SENSOR_STRUCT.size:
+        raise ValueError(f"Binary sensor payload is {len(payload)} bytes, expected {BINARY_SENSOR_STRUCT.size}")
+
+    values = BINARY_SENSOR_STRUCT.unpack(payload)[3:]
+    decoded: Dict[str, Any] = {
+        column: value for column, value in zip(SENSOR_COLUMNS, values) if value == value
+    }
+    # Same ISO form as JSON payloads, so consumers see one timestamp type.
+    decoded["timestamp"] = (EPOCH + timedelta(microseconds=timestamp_ns // 1000)).isoformat()
+    return decoded
+
+def payload_format_for_topic(topic_parts: Sequence[str]) -> Tuple[str, Sequence[str]]:
+    if topic_parts and topic_parts[-1] == BINARY_TOPIC_SUFFIX:
+        return "binary", topic_parts[:-1]
+    return "json", topic_parts
+
+def _as_float(value: Any) -> float:
+    if value is None:
+        return math.nan
+    return float(value)
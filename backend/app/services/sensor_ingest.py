@@ -0,0 +1,206 @@
+import asyncio
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Sequence, Tuple
+from datetime import datetime
+from ..config import settings
+from ..data.processors import SENSOR_COLUMNS
+from ..utils.metrics import Histogram
+
+class SensorBatch:
+    __slots__ = ("machine_ids", "timestamps", "columns", "created_at", "invalid_values")
+
+    def __init__(self, machine_ids: np.ndarray, timestamps: np.ndarray, columns: Dict[str, np.ndarray],
+                 invalid_values: int = 0):
+        self.machine_ids = machine_ids
+        self.timestamps = timestamps
+        self.columns = columns
+        self.created_at = datetime.utcnow()
+        self.invalid_values = invalid_values
+
+    def __len__(self) -> int:
+        return len(self.machine_ids)
+
+    def matrix(self, columns: Sequence[str]) -> np.ndarray:
+        return np.column_stack([self.columns[column] for column in columns]).astype(np.float64, copy=False)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'machine_id': self.machine_ids,
+            'timestamp': self.timestamps,
+            **self.columns
+        }, copy=False)
+
+    @classmethod
+    def from_payloads(cls, machine_ids: List[str], payloads: List[Dict[str, Any]],
+                      columns: Sequence[str]) -> "SensorBatch":
+        values = {}
+        invalid_values = 0
+        for column in columns:
+            values[column], invalid = column_values(payloads, column)
+            invalid_values += invalid
+
+        return cls(
+            np.array(machine_ids, dtype=object),
+            to_datetime64([payload.get("timestamp") for payload in payloads]),
+            values,
+            invalid_values
+        )
+
+def column_values(payloads: List[Dict[str, Any]], column: str) -> Tuple[np.ndarray, int]:
+    try:
+        return np.fromiter((payload.get(column, np.nan) for payload in payloads),
+                           dtype=np.float32, count=len(payloads)), 0
+    except (TypeError, ValueError):
+        pass
+
+    # Slow path for batches holding None or non-numeric values: those rows become NaN.
+    values = np.empty(len(payloads), dtype=np.float32)
+    invalid = 0
+    for i, payload in enumerate(payloads):
+        value, valid = _as_float(payload.get(column))
+        values[i] = value
+        invalid += not valid
+    return values, invalid
+
+def _as_float(value: Any) -> Tuple[float, bool]:
+    if value is None:
+        return np.nan, True
+    try:
+        return float(value), True
+    except (TypeError, ValueError):
+        return np.nan, False
+
+def to_datetime64(values: List[Any]) -> np.ndarray:
+    try:
+        with warnings.catch_warnings():
+            # Offsets such as +00:00 are converted to UTC, which is what we store.
+            warnings.simplefilter("ignore", UserWarning)
+            return np.array(values, dtype='datetime64[ns]')
+    except (ValueError, TypeError):
+        return pd.to_datetime(pd.Series(values), errors='coerce', format='mixed').to_numpy(dtype='datetime64[ns]')
+
+BatchCallback = Callable[[SensorBatch], Awaitable[None]]
+
+class SensorBatchIngestor:
+    def __init__(self, columns: Optional[Sequence[str]] = None, max_batch_size: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None, max_pending_batches: Optional[int] = None):
+        self.columns = list(columns or SENSOR_COLUMNS)
+        self.max_batch_size = max_batch_size or settings.INGEST_MAX_BATCH_SIZE
+        self.max_wait_ms = settings.INGEST_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self.max_pending_batches = max_pending_batches or settings.INGEST_MAX_PENDING_BATCHES
+
+        self.subscribers: List[BatchCallback] = []
+        self.machine_ids: List[str] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.batches: Optional[asyncio.Queue] = None
+        self.delivery_task: Optional[asyncio.Task] = None
+        self.flush_tasks = set()
+
+        self.batch_size_histogram = Histogram(buckets=[1, 10, 50, 100, 250, 500, 1000, 2500, 5000])
+        self.delivery_ms_histogram = Histogram()
+        self.reading_count = 0
+        self.batch_count = 0
+        self.subscriber_errors = 0
+        self.invalid_values = 0
+
+    def subscribe(self, callback: BatchCallback):
+        self.subscribers.append(callback)
+
+    def start(self):
+        if self.delivery_task is None:
+            self.batches = asyncio.Queue(maxsize=self.max_pending_batches)
+            self.delivery_task = asyncio.get_running_loop().create_task(self._deliver())
+
+    async def stop(self):
+        if self.batches is None:
+            return
+        await self.flush()
+        await self.batches.join()
+        if self.delivery_task is not None:
+            self.delivery_task.cancel()
+            try:
+                await self.delivery_task
+            except asyncio.CancelledError:
+                pass
+            self.delivery_task = None
+
+    async def add(self, machine_id: str, payload: Dict[str, Any]):
+        self.machine_ids.append(machine_id)
+        self.payloads.append(payload)
+        self.reading_count += 1
+
+        if len(self.payloads) >= self.max_batch_size:
+            await self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.max_wait_ms / 1000, self._flush_on_timer)
+
+    async def flush(self):
+        batch = self._take_batch()
+        if self.flush_tasks:
+            # Timer flushes that found the queue full go first to keep batches in order.
+            await asyncio.gather(*self.flush_tasks)
+        if batch is not None:
+            await self.batches.put(batch)
+
+    def _flush_on_timer(self):
+        self.timer = None
+        batch = self._take_batch()
+        if batch is None:
+            return
+
+        try:
+            self.batches.put_nowait(batch)
+        except asyncio.QueueFull:
+            task = asyncio.get_running_loop().create_task(self.batches.put(batch))
+            self.flush_tasks.add(task)
+            task.add_done_callback(self.flush_tasks.discard)
+
+    def _take_batch(self) -> Optional[SensorBatch]:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.payloads:
+            return None
+
+        machine_ids, payloads = self.machine_ids, self.payloads
+        self.machine_ids = []
+        self.payloads = []
+
+        batch = SensorBatch.from_payloads(machine_ids, payloads, self.columns)
+        self.invalid_values += batch.invalid_values
+        self.batch_count += 1
+        self.batch_size_histogram.observe(len(batch))
+        return batch
+
+    async def _deliver(self):
+        while True:
+            batch = await self.batches.get()
+            try:
+                for callback in self.subscribers:
+                    try:
+                        await callback(batch)
+                    except Exception as e:
+                        self.subscriber_errors += 1
+                        print(f"Error in sensor batch subscriber: {e}")
+                age_ms = (datetime.utcnow() - batch.created_at).total_seconds() * 1000
+                self.delivery_ms_histogram.observe(age_ms)
+            finally:
+                self.batches.task_done()
+
+    def get_ingest_stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batch_subscribers": len(self.subscribers),
+            "total_readings": self.reading_count,
+            "total_batches": self.batch_count,
+            "pending_readings": len(self.payloads),
+            "queued_batches": self.batches.qsize() if self.batches is not None else 0,
+            "subscriber_errors": self.subscriber_errors,
+            "invalid_values": self.invalid_values,
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "delivery_ms": self.delivery_ms_histogram.snapshot()
+        }
@@ -0,0 +1,193 @@
+import copy
+import numpy as np
+from typing import List, Optional
+from sklearn.ensemble import (
+    RandomForestClassifier, RandomForestRegressor, GradientBoostingRegressor
+)
+from sklearn.preprocessing import StandardScaler
+
+def _iter_trees(model):
+    if isinstance(model, (RandomForestClassifier, RandomForestRegressor)):
+        return [estimator.tree_ for estimator in model.estimators_]
+    if isinstance(model, GradientBoostingRegressor):
+        return [estimator.tree_ for estimator in model.estimators_[:, 0]]
+    raise TypeError(f"Cannot fold a scaler into model of type {type(model).__name__}")
+
+def _float32_order(values: np.ndarray) -> np.ndarray:
+    bits = values.astype(np.float32).view(np.int32).astype(np.int64)
+    return np.where(bits < 0, -(bits & 0x7FFFFFFF), bits)
+
+def _float32_from_order(order: np.ndarray) -> np.ndarray:
+    bits = np.where(order < 0, (-order) | 0x80000000, order).astype(np.uint32)
+    return bits.view(np.float32).astype(np.float64)
+
+def _raw_thresholds(thresholds: np.ndarray, mean: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    # sklearn casts inputs to float32 before comparing, so the scaled model sends x
+    # left when float32((x - mean) / scale) <= t. That is monotone in x, so bisect
+    # over float32 bit patterns for the largest raw float32 that still goes left.
+    lowest = _float32_order(np.array([np.finfo(np.float32).min]))[0]
+    low = np.full(len(thresholds), lowest - 1)
+    high = np.full(len(thresholds), -lowest + 1)
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        while np.any(high - low > 1):
+            middle = (low + high) // 2
+            scaled = ((_float32_from_order(middle) - mean) / scale).astype(np.float32)
+            goes_left = scaled <= thresholds
+            low = np.where(goes_left, middle, low)
+            high = np.where(goes_left, high, middle)
+
+    raw = np.full(len(thresholds), -np.inf)
+    found = low >= lowest
+    raw[found] = _float32_from_order(low[found])
+    return raw
+
+def fold_scaler(model, scaler: StandardScaler):
+    if not isinstance(scaler, StandardScaler):
+        raise TypeError(f"Cannot fold scaler of type {type(scaler).__name__}")
+
+    n_features = model.n_features_in_
+    mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+
+    folded = copy.deepcopy(model)
+    for tree in _iter_trees(folded):
+        state = tree.__getstate__()
+        nodes = state['nodes'].copy()
+        is_split = nodes['left_child'] != -1
+        split_features = nodes['feature'][is_split]
+
+        nodes['threshold'][is_split] = _raw_thresholds(
+            nodes['threshold'][is_split], mean[split_features], scale[split_features]
+        )
+        state['nodes'] = nodes
+        tree.__setstate__(state)
+
+    return folded
+
+class CompiledTreeEnsemble:
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray, right: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, max_depth: int, n_features: int,
+                 base_value: float = 0.0, tree_weight: float = 1.0, average: bool = True,
+                 classes: Optional[np.ndarray] = None, fallback=None, max_batch_rows: Optional[int] = None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features
+        self.base_value = base_value
+        self.tree_weight = tree_weight
+        self.average = average
+        self.classes_ = classes
+        self.fallback = fallback
+        self.max_batch_rows = max_batch_rows
+
+    @classmethod
+    def from_sklearn(cls, model, max_batch_rows: Optional[int] = None) -> "CompiledTreeEnsemble":
+        if isinstance(model, RandomForestClassifier):
+            compiled = cls._compile(model.estimators_, model.n_features_in_, classes=model.classes_)
+        elif isinstance(model, RandomForestRegressor):
+            compiled = cls._compile(model.estimators_, model.n_features_in_)
+        elif isinstance(model, GradientBoostingRegressor):
+            if model.init_ == 'zero':
+                base_value = 0.0
+            else:
+                base_value = float(model.init_.predict(np.zeros((1, model.n_features_in_)))[0])
+            compiled = cls._compile(
+                model.estimators_[:, 0], model.n_features_in_,
+                base_value=base_value, tree_weight=model.learning_rate, average=False
+            )
+        else:
+            raise TypeError(f"Cannot compile model of type {type(model).__name__}")
+
+        # Large batches are faster through sklearn's Cython traversal.
+        if max_batch_rows is not None:
+            compiled.fallback = model
+            compiled.max_batch_rows = max_batch_rows
+        return compiled
+
+    @classmethod
+    def _compile(cls, estimators: List, n_features: int, base_value: float = 0.0,
+                 tree_weight: float = 1.0, average: bool = True,
+                 classes: Optional[np.ndarray] = None) -> "CompiledTreeEnsemble":
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in estimators:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.int64) + offset
+            is_leaf = tree.children_left == -1
+
+            # Leaves point at themselves so every row can take exactly max_depth steps.
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+
+            node_values = tree.value[:, 0, :]
+            if classes is not None:
+                node_values = node_values / node_values.sum(axis=1, keepdims=True)
+            values.append(node_values)
+
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.int64),
+            max_depth=max_depth,
+            n_features=n_features,
+            base_value=base_value,
+            tree_weight=tree_weight,
+            average=average,
+            classes=classes
+        )
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        # sklearn compares float32 inputs against float64 thresholds.
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected a 2-D array with {self.n_features_in_} columns, got shape {X.shape}")
+
+        rows = np.arange(X.shape[0])[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], X.shape[0], axis=1)
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return nodes
+
+    def _aggregate(self, X: np.ndarray) -> np.ndarray:
+        leaf_values = self.value[self.apply(X)]
+        if self.average:
+            return leaf_values.mean(axis=0)
+        return self.base_value + self.tree_weight * leaf_values.sum(axis=0)
+
+    def _use_fallback(self, X: np.ndarray) -> bool:
+        return self.fallback is not None and len(X) > self.max_batch_rows
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        if self.classes_ is None:
+            raise AttributeError("predict_proba is only available for classifiers")
+        if self._use_fallback(X):
+            return self.fallback.predict_proba(X)
+        return self._aggregate(X)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self._use_fallback(X):
+            return self.fallback.predict(X)
+
+        aggregated = self._aggregate(X)
+        if self.classes_ is not None:
+            return self.classes_.take(np.argmax(aggregated, axis=1))
+        return aggregated[:, 0]
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import uuid
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+def _json_default(value):
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+def new_job(job_type: str, payload: Any) -> Dict[str, Any]:
+    return {
+        "job_id": uuid.uuid4().hex,
+        "type": job_type,
+        "payload": payload,
+        "submitted_at": datetime.utcnow().isoformat()
+    }
+
+class InMemoryJobQueue:
+    def __init__(self):
+        self.jobs: asyncio.Queue = asyncio.Queue()
+        self.results: Dict[str, asyncio.Future] = {}
+
+    async def submit(self, job_type: str, payload: Any) -> str:
+        job = new_job(job_type, payload)
+        self._result_future(job["job_id"])
+        await self.jobs.put(job)
+        return job["job_id"]
+
+    async def pop_job(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self.jobs.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def publish_result(self, result: Dict[str, Any]):
+        future = self._result_future(result["job_id"])
+        if not future.done():
+            future.set_result(result)
+
+    async def get_result(self, job_id: str, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._result_future(job_id)), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            future = self.results.get(job_id)
+            if future is not None and future.done():
+                del self.results[job_id]
+
+    async def depth(self) -> int:
+        return self.jobs.qsize()
+
+    async def close(self):
+        pass
+
+    def _result_future(self, job_id: str) -> asyncio.Future:
+        if job_id not in self.results:
+            self.results[job_id] = asyncio.get_running_loop().create_future()
+        return self.results[job_id]
+
+class RedisJobQueue:
+    def __init__(self, redis_url: str, queue_name: str, result_ttl_seconds: int = 300):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(redis_url)
+        self.queue_name = queue_name
+        self.result_ttl_seconds = result_ttl_seconds
+
+    async def submit(self, job_type: str, payload: Any) -> str:
+        job = new_job(job_type, payload)
+        await self.client.lpush(self.queue_name, json.dumps(job, default=_json_default))
+        return job["job_id"]
+
+    async def pop_job(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+        item = await self.client.brpop(self.queue_name, timeout=timeout)
+        if item is None:
+            return None
+        return json.loads(item[1])
+
+    async def publish_result(self, result: Dict[str, Any]):
+        key = self._result_key(result["job_id"])
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, json.dumps(result, default=_json_default))
+            pipe.expire(key, self.result_ttl_seconds)
+            await pipe.execute()
+
+    async def get_result(self, job_id: str, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+        item = await self.client.blpop(self._result_key(job_id), timeout=timeout)
+        if item is None:
+            return None
+        return json.loads(item[1])
+
+    async def depth(self) -> int:
+        return await self.client.llen(self.queue_name)
+
+    async def close(self):
+        await self.client.aclose()
+
+    def _result_key(self, job_id: str) -> str:
+        return f"{self.queue_name}:results:{job_id}"
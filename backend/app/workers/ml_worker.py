@@ -0,0 +1,161 @@
+import asyncio
+import signal
+import time
+import pandas as pd
+from typing import Dict, Any, Optional
+from datetime import datetime
+from ..config import settings
+from ..data.loaders import DatasetLoader
+from ..services.ml_service import MLService
+from ..utils.metrics import Histogram
+from .job_queue import RedisJobQueue
+
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 30000, 120000]
+
+TRAINING_DATASETS = {
+    "train_anomaly_detector": "load_sensor_faults_dataset",
+    "train_failure_predictor": "load_failure_dataset",
+    "train_rul_estimator": "load_failure_dataset"
+}
+
+class MLWorker:
+    def __init__(self, ml_service: MLService, queue, concurrency: Optional[int] = None,
+                 dataset_loader: Optional[DatasetLoader] = None):
+        self.ml_service = ml_service
+        self.queue = queue
+        self.concurrency = concurrency or settings.ML_WORKER_CONCURRENCY
+        self.dataset_loader = dataset_loader
+
+        self.inference_handlers = {
+            "predict_anomaly": ml_service.predict_anomaly_batch,
+            "predict_failure": ml_service.predict_failure_batch,
+            "estimate_rul": ml_service.estimate_rul_batch,
+            "assess_machines": ml_service.assess_machines
+        }
+        self.training_handlers = {
+            "train_anomaly_detector": ml_service.train_anomaly_detector,
+            "train_failure_predictor": ml_service.train_failure_predictor,
+            "train_rul_estimator": ml_service.train_rul_estimator
+        }
+
+        self.stopping = asyncio.Event()
+        self.started_at: Optional[float] = None
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.rows_processed = 0
+        self.in_flight = 0
+        self.jobs_by_type: Dict[str, int] = {}
+        self.latency_histogram = Histogram(LATENCY_BUCKETS_MS)
+
+    async def run(self):
+        self.started_at = time.monotonic()
+        print(f"ML worker started with concurrency {self.concurrency}")
+
+        consumers = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        await asyncio.gather(*consumers)
+
+        print(f"ML worker stopped: {self.get_worker_stats()}")
+
+    def stop(self):
+        self.stopping.set()
+
+    async def _consume(self):
+        while not self.stopping.is_set():
+            try:
+                job = await self.queue.pop_job(timeout=1.0)
+            except Exception as e:
+                print(f"Failed to fetch ML job: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if job is None:
+                continue
+
+            self.in_flight += 1
+            try:
+                result = await self.process_job(job)
+                await self.queue.publish_result(result)
+            except Exception as e:
+                print(f"Failed to publish result for ML job {job.get('job_id')}: {e}")
+            finally:
+                self.in_flight -= 1
+
+    async def process_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        job_type = job.get("type")
+        payload = job.get("payload")
+        start_time = time.perf_counter()
+
+        try:
+            if job_type in self.inference_handlers:
+                output = await self.inference_handlers[job_type](payload)
+                self.rows_processed += len(output)
+            elif job_type in self.training_handlers:
+                output = await self.training_handlers[job_type](await self._training_frame(job_type, payload))
+            else:
+                raise ValueError(f"Unknown job type {job_type}")
+
+            status, body = "completed", {"result": output}
+            self.jobs_completed += 1
+        except Exception as e:
+            print(f"ML job {job.get('job_id')} ({job_type}) failed: {e}")
+            status, body = "failed", {"error": str(e)}
+            self.jobs_failed += 1
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        self.latency_histogram.observe(latency_ms)
+        self.jobs_by_type[job_type] = self.jobs_by_type.get(job_type, 0) + 1
+
+        return {
+            "job_id": job.get("job_id"),
+            "type": job_type,
+            "status": status,
+            **body,
+            "latency_ms": latency_ms,
+            "completed_at": datetime.utcnow().isoformat()
+        }
+
+    async def _training_frame(self, job_type: str, payload: Optional[Dict[str, Any]]) -> pd.DataFrame:
+        payload = payload or {}
+        if "records" in payload:
+            return pd.DataFrame(payload["records"])
+
+        if self.dataset_loader is None:
+            self.dataset_loader = DatasetLoader()
+        return await getattr(self.dataset_loader, TRAINING_DATASETS[job_type])()
+
+    def get_worker_stats(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self.started_at if self.started_at else 0.0
+
+        return {
+            "concurrency": self.concurrency,
+            "uptime_seconds": uptime,
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "jobs_in_flight": self.in_flight,
+            "jobs_by_type": dict(self.jobs_by_type),
+            "rows_processed": self.rows_processed,
+            "jobs_per_second": (self.jobs_completed + self.jobs_failed) / uptime if uptime else 0.0,
+            "rows_per_second": self.rows_processed / uptime if uptime else 0.0,
+            "latency_ms": self.latency_histogram.snapshot(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+async def main():
+    ml_service = MLService()
+    await ml_service.startup()
+
+    queue = RedisJobQueue(settings.REDIS_URL, settings.ML_WORKER_QUEUE, settings.ML_WORKER_RESULT_TTL_SECONDS)
+    worker = MLWorker(ml_service, queue)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await queue.close()
+        ml_service.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import asyncio
+import time
+import numpy as np
+from backend.app.services.ml_service import MLService, INFERENCE_BACKENDS
+
+BATCH_SIZES = [1, 64, 1024, 10000]
+LATENCY_BATCH_SIZES = [1, 1024]
+TIME_BUDGET_SECONDS = 2.0
+
+def make_sensor_rows(n_rows: int) -> np.ndarray:
+    rng = np.random.default_rng(42)
+    return np.column_stack([
+        rng.normal(60, 15, n_rows),
+        rng.normal(0.4, 0.2, n_rows),
+        rng.normal(60, 15, n_rows),
+        rng.normal(45, 15, n_rows)
+    ])
+
+async def benchmark_batch_size(ml_service: MLService, batch_size: int) -> float:
+    batch = make_sensor_rows(batch_size)
+
+    await ml_service.predict_anomaly_batch(batch)
+
+    n_iterations = 0
+    start_time = time.perf_counter()
+    while time.perf_counter() - start_time < TIME_BUDGET_SECONDS:
+        await ml_service.predict_anomaly_batch(batch)
+        n_iterations += 1
+    elapsed = time.perf_counter() - start_time
+
+    return batch_size * n_iterations / elapsed
+
+async def benchmark_latency(ml_service: MLService, batch_size: int) -> np.ndarray:
+    batch = make_sensor_rows(batch_size)
+
+    await ml_service.predict_anomaly_batch(batch)
+
+    latencies = []
+    start_time = time.perf_counter()
+    while time.perf_counter() - start_time < TIME_BUDGET_SECONDS or len(latencies) < 20:
+        call_start = time.perf_counter()
+        await ml_service.predict_anomaly_batch(batch)
+        latencies.append((time.perf_counter() - call_start) * 1000)
+
+    return np.array(latencies)
+
+async def run_benchmark():
+    print("Anomaly detector batch inference throughput")
+    print(f"{'backend':>10}  {'batch_size':>10}  {'rows/sec':>12}")
+
+    for backend in INFERENCE_BACKENDS:
+        ml_service = MLService(inference_backend=backend)
+        ml_service.load_model('anomaly_detector')
+
+        for batch_size in BATCH_SIZES:
+            rows_per_sec = await benchmark_batch_size(ml_service, batch_size)
+            print(f"{backend:>10}  {batch_size:>10}  {rows_per_sec:>12.0f}")
+
+        ml_service.shutdown()
+
+    print("\nAnomaly detector call latency (ms)")
+    print(f"{'backend':>10}  {'batch_size':>10}  {'p50':>10}  {'p99':>10}")
+
+    for backend in INFERENCE_BACKENDS:
+        ml_service = MLService(inference_backend=backend)
+        ml_service.load_model('anomaly_detector')
+
+        for batch_size in LATENCY_BATCH_SIZES:
+            latencies = await benchmark_latency(ml_service, batch_size)
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"{backend:>10}  {batch_size:>10}  {p50:>10.3f}  {p99:>10.3f}")
+
+        ml_service.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
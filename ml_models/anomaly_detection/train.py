@@ -32,7 +32,7 @@ async def train_anomaly_detector():
     for feature, importance in results['feature_importance'].items():
         print(f"  {feature}: {importance:.4f}")
     
-    print(f"\nModel saved successfully at: ml_models/saved/anomaly_detector.pkl")
+    print(f"\nModel saved successfully at: ml_models/saved/anomaly_detector/{results['version']}")
 
 if __name__ == "__main__":
     asyncio.run(train_anomaly_detector())
\ No newline at end of file
@@ -29,7 +29,7 @@ async def train_rul_estimator():
     print(f"Training Samples: {results['training_samples']}")
     print(f"Test Samples: {results['test_samples']}")
     
-    print(f"\nModel saved successfully at: ml_models/saved/rul_estimator.pkl")
+    print(f"\nModel saved successfully at: ml_models/saved/rul_estimator/{results['version']}")
 
 if __name__ == "__main__":
     asyncio.run(train_rul_estimator())
\ No newline at end of file
@@ -32,7 +32,7 @@ async def train_failure_predictor():
     for feature, importance in results['feature_importance'].items():
         print(f"  {feature}: {importance:.4f}")
     
-    print(f"\nModel saved successfully at: ml_models/saved/failure_predictor.pkl")
+    print(f"\nModel saved successfully at: ml_models/saved/failure_predictor/{results['version']}")
 
 if __name__ == "__main__":
     asyncio.run(train_failure_predictor())
\ No newline at end of file
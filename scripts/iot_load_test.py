@@ -0,0 +1,297 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+import resource
+import socket
+import struct
+import threading
+import time
+import numpy as np
+from backend.app.services.iot_broker import IoTBrokerService, BROKER_TRANSPORTS
+from backend.app.services.mqtt_bridge import OVERFLOW_POLICIES
+from backend.app.services.sensor_codec import sensor_topic, encode_sensor_payload, decode_sensor_payload
+
+PAYLOAD_CHOICES = ("json", "binary", "mixed")
+
+TICK_SECONDS = 0.005
+
+def encode_length(length: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        length, digit = divmod(length, 128)
+        encoded.append(digit | (0x80 if length else 0))
+        if not length:
+            return bytes(encoded)
+
+def encode_publish(topic: str, payload: bytes) -> bytes:
+    topic_bytes = topic.encode()
+    body = struct.pack('!H', len(topic_bytes)) + topic_bytes + payload
+    return b'\x30' + encode_length(len(body)) + body
+
+class StandInBroker:
+    # Just enough MQTT 3.1.1 to accept one client, stream QoS 0 publishes at
+    # it, and acknowledge and echo back whatever it publishes.
+
+    def __init__(self):
+        self.server = socket.create_server(('127.0.0.1', 0))
+        self.port = self.server.getsockname()[1]
+        self.connection = None
+        self.subscribed = threading.Event()
+        self.sent = 0
+        self.send_stalls = 0.0
+        self.send_lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        self.connection, _ = self.server.accept()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            header = self._read(1)
+            if not header:
+                return
+            length, multiplier = 0, 1
+            while True:
+                digit = self._read(1)[0]
+                length += (digit & 0x7F) * multiplier
+                multiplier *= 128
+                if not digit & 0x80:
+                    break
+            body = self._read(length)
+
+            packet_type = header[0] >> 4
+            if packet_type == 1:
+                self._send(b'\x20\x02\x00\x00')
+            elif packet_type == 3:
+                self._handle_publish(header[0], body)
+            elif packet_type == 6:
+                self._send(b'\x70\x02' + body[:2])
+            elif packet_type == 8:
+                granted = bytes(body[i + 2] & 0x03 for i in self._topic_offsets(body))
+                self._send(b'\x90' + encode_length(2 + len(granted)) + body[:2] + granted)
+                self.subscribed.set()
+            elif packet_type == 12:
+                self._send(b'\xd0\x00')
+            elif packet_type == 14:
+                return
+
+    def _handle_publish(self, flags: int, body: bytes):
+        qos = (flags >> 1) & 0x03
+        topic_length = struct.unpack('!H', body[:2])[0]
+        topic = body[2:2 + topic_length].decode()
+        offset = 2 + topic_length
+        reply = b''
+        if qos == 1:
+            reply = b'\x40\x02' + body[offset:offset + 2]
+        elif qos == 2:
+            reply = b'\x50\x02' + body[offset:offset + 2]
+        if qos:
+            offset += 2
+        self._send(reply + encode_publish(topic, body[offset:]))
+
+    def _send(self, data: bytes):
+        with self.send_lock:
+            self.connection.sendall(data)
+
+    def _topic_offsets(self, body: bytes):
+        offset = 2
+        while offset < len(body):
+            topic_length = struct.unpack('!H', body[offset:offset + 2])[0]
+            yield offset + topic_length
+            offset += topic_length + 3
+
+    def _read(self, n_bytes: int) -> bytes:
+        data = b''
+        while len(data) < n_bytes:
+            chunk = self.connection.recv(n_bytes - len(data))
+            if not chunk:
+                return b''
+            data += chunk
+        return data
+
+    def stream(self, rate: int, seconds: float, n_machines: int, payload_format: str = "json"):
+        packets = []
+        for i in range(n_machines):
+            packet_format = payload_format if payload_format != "mixed" else ("json", "binary")[i % 2]
+            reading = {
+                "temperature": 60.0 + i % 20,
+                "vibration": 0.4,
+                "pressure": 55.0,
+                "power_consumption": 40.0
+            }
+            packets.append(encode_publish(
+                sensor_topic(f"M{i:05d}", packet_format), encode_sensor_payload(reading, packet_format)
+            ))
+
+        start = time.perf_counter()
+        next_index = 0
+        while True:
+            elapsed = time.perf_counter() - start
+            if elapsed >= seconds:
+                break
+            due = int(elapsed * rate) + 1
+            if due > self.sent:
+                burst = b''.join(packets[(next_index + i) % n_machines] for i in range(due - self.sent))
+                next_index = (next_index + due - self.sent) % n_machines
+                send_start = time.perf_counter()
+                self._send(burst)
+                self.send_stalls += max(0.0, time.perf_counter() - send_start - TICK_SECONDS)
+                self.sent = due
+            time.sleep(TICK_SECONDS)
+
+async def run(transport: str, policy: str, rate: int, seconds: float, n_machines: int,
+              consumer_rate: float, maxsize: int, batches: bool, payload_format: str):
+    broker = StandInBroker()
+    broker.start()
+
+    service = IoTBrokerService(
+        '127.0.0.1', broker.port, queue_maxsize=maxsize, overflow_policy=policy, transport=transport
+    )
+    delivered = 0
+    missing_values = 0
+
+    async def consume(machine_id, payload):
+        nonlocal delivered
+        delivered += 1
+        if consumer_rate and delivered % 100 == 0:
+            await asyncio.sleep(100 / consumer_rate)
+
+    async def consume_batch(batch):
+        nonlocal delivered, missing_values
+        delivered += len(batch)
+        missing_values += int(np.isnan(batch.matrix(batch.columns)).sum() + np.isnat(batch.timestamps).sum())
+        if consumer_rate:
+            await asyncio.sleep(len(batch) / consumer_rate)
+
+    if batches:
+        await service.subscribe_to_batches(consume_batch)
+    else:
+        await service.subscribe_to_all_machines(consume)
+    await service.connect()
+    await asyncio.to_thread(broker.subscribed.wait, 5)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    await asyncio.to_thread(broker.stream, rate, seconds, n_machines, payload_format)
+    send_elapsed = time.perf_counter() - start
+
+    deadline = time.perf_counter() + 5
+    while time.perf_counter() < deadline:
+        stats = (await service.get_broker_stats())["ingest_queue"]
+        drained = stats["queue_depth"] == 0 and stats["handoff_backlog"] == 0 and not batches
+        if delivered >= broker.sent or (service.message_count >= broker.sent and drained):
+            break
+        await asyncio.sleep(0.05)
+    drain_elapsed = time.perf_counter() - start
+
+    broker_stats = await service.get_broker_stats()
+    stats = broker_stats["ingest_queue"]
+    await service.disconnect()
+
+    print(
+        f"{transport:>7} {policy:>23} | sent {broker.sent:>7} ({broker.sent / send_elapsed:>7.0f}/s) | "
+        f"parsed {service.message_count:>7} | delivered {delivered:>7} ({delivered / drain_elapsed:>7.0f}/s) | "
+        f"max depth {stats['max_queue_depth']:>6} | dropped old/new {stats['dropped_oldest']}/{stats['dropped_newest']} | "
+        f"conflated {stats['conflated']} | sender stalled {broker.send_stalls:.2f}s | "
+        f"{payload_format} {broker_stats['messages_by_format']} missing {missing_values} | "
+        f"RSS +{(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024:.1f} MB"
+    )
+
+async def run_latency(transport: str, n_messages: int, concurrency: int):
+    broker = StandInBroker()
+    broker.start()
+
+    service = IoTBrokerService('127.0.0.1', broker.port, transport=transport)
+    arrivals = {}
+    done = asyncio.Event()
+
+    async def consume(machine_id, payload):
+        arrivals[payload["seq"]] = time.perf_counter()
+        if len(arrivals) == n_messages:
+            done.set()
+
+    await service.subscribe_to_all_machines(consume)
+    await service.connect()
+    await asyncio.to_thread(broker.subscribed.wait, 5)
+
+    sent_at = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def publish(seq: int):
+        async with semaphore:
+            sent_at[seq] = time.perf_counter()
+            await service.publish_sensor_data(f"M{seq % 1000:05d}", {"seq": seq, "temperature": 60.0})
+            if concurrency == 1:
+                while seq not in arrivals:
+                    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(publish(seq) for seq in range(n_messages)))
+    try:
+        await asyncio.wait_for(done.wait(), 10)
+    except asyncio.TimeoutError:
+        pass
+    elapsed = time.perf_counter() - start
+    await service.disconnect()
+
+    latencies = np.array([(arrivals[seq] - sent_at[seq]) * 1000 for seq in arrivals])
+    print(
+        f"{transport:>7} concurrency {concurrency:>4} | {len(arrivals)}/{n_messages} echoed | "
+        f"{len(arrivals) / elapsed:>7.0f} msg/s | latency p50 {np.percentile(latencies, 50):.3f} ms "
+        f"p99 {np.percentile(latencies, 99):.3f} ms"
+    )
+
+def benchmark_codec(n_messages: int = 100000):
+    reading = {"temperature": 72.5, "vibration": 0.43, "pressure": 61.2, "power_consumption": 47.9}
+    for payload_format in ("json", "binary"):
+        start = time.perf_counter()
+        for _ in range(n_messages):
+            payload = encode_sensor_payload(reading, payload_format)
+        encode_us = (time.perf_counter() - start) / n_messages * 1e6
+
+        start = time.perf_counter()
+        for _ in range(n_messages):
+            decode_sensor_payload(payload, payload_format)
+        decode_us = (time.perf_counter() - start) / n_messages * 1e6
+
+        print(f"{payload_format:>6} | {len(payload):>4} bytes | encode {encode_us:.2f} us | decode {decode_us:.2f} us")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test IoTBrokerService against a local MQTT stand-in")
+    parser.add_argument('--rate', type=int, default=20000)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--machines', type=int, default=1000)
+    parser.add_argument('--consumer-rate', type=float, default=0.0,
+                        help="messages per second the subscriber can handle, 0 for unthrottled")
+    parser.add_argument('--queue-size', type=int, default=10000)
+    parser.add_argument('--policy', choices=OVERFLOW_POLICIES, action='append')
+    parser.add_argument('--batches', action='store_true', help="consume through micro-batch subscribers")
+    parser.add_argument('--payload-format', choices=PAYLOAD_CHOICES, default="json")
+    parser.add_argument('--codec', action='store_true', help="benchmark sensor payload encode/decode and exit")
+    parser.add_argument('--transport', choices=BROKER_TRANSPORTS, action='append')
+    parser.add_argument('--latency', action='store_true',
+                        help="measure publish -> broker -> subscriber round trips instead of inbound load")
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.codec:
+        benchmark_codec()
+        return
+
+    for transport in args.transport or BROKER_TRANSPORTS:
+        if args.latency:
+            asyncio.run(run_latency(transport, args.messages, args.concurrency))
+            continue
+        for policy in args.policy or OVERFLOW_POLICIES:
+            asyncio.run(run(
+                transport, policy, args.rate, args.seconds, args.machines, args.consumer_rate, args.queue_size,
+                args.batches, args.payload_format
+            ))
+
+if __name__ == "__main__":
+    main()
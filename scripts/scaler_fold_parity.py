@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+import time
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.model_selection import train_test_split
+from backend.app.data.loaders import DatasetLoader
+from backend.app.services.ml_service import ANOMALY_FEATURES, _score_classifier
+from backend.app.services.tree_compiler import CompiledTreeEnsemble, fold_scaler
+
+def train_anomaly_detector(X: np.ndarray, y: np.ndarray):
+    # Same preprocessing and hyperparameters as MLService.train_anomaly_detector.
+    scaler = StandardScaler()
+    X_train, _, y_train, _ = train_test_split(scaler.fit_transform(X), y, test_size=0.2, random_state=42)
+    model = RandomForestClassifier(
+        n_estimators=200,
+        max_depth=15,
+        min_samples_split=10,
+        min_samples_leaf=5,
+        random_state=42
+    )
+    model.fit(X_train, y_train)
+    return model, scaler
+
+def single_row_latency(model, scaler, X: np.ndarray, n_rows: int) -> str:
+    timings = []
+    for row in X[:n_rows]:
+        start = time.perf_counter()
+        _score_classifier(model, scaler, row.reshape(1, -1))
+        timings.append((time.perf_counter() - start) * 1000)
+    return f"p50 {np.percentile(timings, 50):.3f} ms p99 {np.percentile(timings, 99):.3f} ms"
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that folding the scaler into the trees keeps predictions identical")
+    parser.add_argument('--latency-rows', type=int, default=2000)
+    args = parser.parse_args()
+
+    data = asyncio.run(DatasetLoader().load_sensor_faults_dataset())
+    X = data[ANOMALY_FEATURES].to_numpy(dtype=np.float64)
+    model, scaler = train_anomaly_detector(X, data['is_anomaly'].to_numpy())
+    folded = fold_scaler(model, scaler)
+
+    backends = {
+        "sklearn": (model, folded),
+        "compiled": (CompiledTreeEnsemble.from_sklearn(model), CompiledTreeEnsemble.from_sklearn(folded))
+    }
+
+    failures = 0
+    for backend, (scaled_model, folded_model) in backends.items():
+        labels, probabilities = _score_classifier(scaled_model, scaler, X)
+        folded_labels, folded_probabilities = _score_classifier(folded_model, None, X)
+        changed = int(np.sum(np.any(probabilities != folded_probabilities, axis=1) | (labels != folded_labels)))
+        failures += changed
+        print(f"{backend:>8} | {len(X)} sensor_faults rows | {changed} predictions differ | "
+              f"scaled {single_row_latency(scaled_model, scaler, X, args.latency_rows)} | "
+              f"folded {single_row_latency(folded_model, None, X, args.latency_rows)}")
+
+    if failures:
+        sys.exit(f"Scaler folding changed {failures} predictions")
+    print("Folded predictions are identical")
+
+if __name__ == "__main__":
+    main()